@@ -10,13 +10,40 @@
 # Then run: uvicorn FastAPI_Basics:app --reload
 # ============================================================
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+import csv
+import io
+import json
+import os
+import threading
+import zlib
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
+
+from FastAPI_RateLimiting import TokenBucketMiddleware, SQLiteBucketStore
+from FastAPI_Search import SearchIndex
+from FastAPI_ChangeFeed import ChangeBroker, format_sse
+from FastAPI_Stats import RunningStats
 
 # Initialize the FastAPI app
 app = FastAPI(title="My First API", description="Learning FastAPI Basics", version="1.0.0")
 
+# Rate limiting: each client may burst 20 requests, refilled at 10 per second.
+# Excess requests get a 429 before routing or body validation happens.
+# With several workers (uvicorn --workers N), set RATE_LIMIT_DB to a SQLite
+# file path so all workers share the same buckets.
+RATE_LIMIT_RATE = 10.0
+RATE_LIMIT_CAPACITY = 20
+_rate_limit_db = os.environ.get("RATE_LIMIT_DB")
+app.add_middleware(
+    TokenBucketMiddleware,
+    rate=RATE_LIMIT_RATE,
+    capacity=RATE_LIMIT_CAPACITY,
+    store=SQLiteBucketStore(_rate_limit_db, RATE_LIMIT_RATE, RATE_LIMIT_CAPACITY) if _rate_limit_db else None,
+)
+
 # ============================================================
 # 1. BASIC ROUTING (GET)
 # ============================================================
@@ -51,6 +78,21 @@ class Item(BaseModel):
 # A mock database
 fake_db = {}
 
+# Full-text index over name/description, kept in sync by every write below
+search_index = SearchIndex(fields=("name", "description"))
+
+# Every write also publishes an event for the /items/changes feed
+change_broker = ChangeBroker(history_size=1000, buffer_size=100)
+
+# Running count/sum/min/max of prices and taxes, for /items/stats
+item_stats = RunningStats()
+
+# Sync handlers run in a threadpool. Each write reads the old item, adjusts
+# the stats and index and then stores the new one; those steps must not
+# interleave with another write, or two creates of the same new name would
+# both count it. Reads don't take the lock.
+db_write_lock = threading.Lock()
+
 @app.post("/items/")
 def create_item(item: Item):
     """Endpoint to create an item using a POST request."""
@@ -61,7 +103,11 @@ def create_item(item: Item):
         item_dict.update({"price_with_tax": price_with_tax})
     
     # "Save" to db
-    fake_db[item.name] = item_dict
+    with db_write_lock:
+        item_stats.replace(fake_db.get(item.name), item_dict)
+        fake_db[item.name] = item_dict
+        search_index.add(item.name, item_dict)
+        change_broker.publish("create", item.name, item_dict)
     return {"message": "Item created successfully", "item": item_dict}
 
 
@@ -72,25 +118,176 @@ def create_item(item: Item):
 @app.put("/items/{item_name}")
 def update_item(item_name: str, item: Item):
     """Endpoint to update an item."""
-    if item_name not in fake_db:
-        # Returning a 404 error if item not found
-        raise HTTPException(status_code=404, detail="Item not found")
-        
-    fake_db[item_name] = item.dict()
-    return {"message": "Item updated successfully", "item": fake_db[item_name]}
+    updated_item = item.dict()
+    with db_write_lock:
+        if item_name not in fake_db:
+            # Returning a 404 error if item not found
+            raise HTTPException(status_code=404, detail="Item not found")
+
+        item_stats.replace(fake_db[item_name], updated_item)
+        fake_db[item_name] = updated_item
+        search_index.add(item_name, updated_item)
+        change_broker.publish("update", item_name, updated_item)
+    return {"message": "Item updated successfully", "item": updated_item}
 
 @app.delete("/items/{item_name}")
 def delete_item(item_name: str):
     """Endpoint to delete an item."""
-    if item_name not in fake_db:
-        raise HTTPException(status_code=404, detail="Item not found")
-        
-    del fake_db[item_name]
+    with db_write_lock:
+        if item_name not in fake_db:
+            raise HTTPException(status_code=404, detail="Item not found")
+
+        item_stats.remove(fake_db.pop(item_name))
+        search_index.remove(item_name)
+        change_broker.publish("delete", item_name)
     return {"message": f"Item {item_name} deleted successfully"}
 
 
 # ============================================================
-# 4. HOW TO TEST
+# 4. STREAMING EXPORT (NDJSON / CSV)
+# ============================================================
+# Building one big JSON list of every item would hold the whole store
+# (twice!) in memory. A StreamingResponse instead sends the items in small
+# batches as they are serialised, so only one batch of serialised text is
+# held at a time and the client receives the first bytes right away.
+
+EXPORT_BATCH_SIZE = 500
+EXPORT_CSV_FIELDS = ["name", "description", "price", "tax", "price_with_tax"]
+
+def _export_batches(fmt):
+    """Yield the store as text chunks of at most EXPORT_BATCH_SIZE items.
+
+    Memory is not fully bounded: the item names are copied up front, one
+    list entry (a reference to the existing key string, 8 bytes) per item.
+    Only the serialised items are bounded by the batch size. Walking
+    fake_db itself across batches is not possible, because a dict iterator
+    fails once another request adds or deletes an item.
+    """
+    buffer = io.StringIO()
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        yield buffer.getvalue()
+
+    # Snapshot only the keys, so writers can keep changing fake_db meanwhile
+    names = list(fake_db)
+    for start in range(0, len(names), EXPORT_BATCH_SIZE):
+        buffer.seek(0)
+        buffer.truncate()
+        for name in names[start:start + EXPORT_BATCH_SIZE]:
+            item = fake_db.get(name)
+            if item is None:  # deleted since the snapshot
+                continue
+            if writer is not None:
+                writer.writerow(item)
+            else:
+                buffer.write(json.dumps(item))
+                buffer.write("\n")
+        yield buffer.getvalue()
+
+async def _stream_export(fmt, use_gzip):
+    # A gzip stream is flushed after every batch, so compression never
+    # delays the data the client has already been promised
+    compressor = zlib.compressobj(wbits=31) if use_gzip else None  # 31 = gzip container
+    for chunk in _export_batches(fmt):
+        data = chunk.encode()
+        if compressor is not None:
+            data = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+        await asyncio.sleep(0)  # let other requests run between batches
+    if compressor is not None:
+        yield compressor.flush()
+
+@app.get("/items/export")
+async def export_items(request: Request, format: Literal["ndjson", "csv"] = "ndjson"):
+    """Stream every item as NDJSON or CSV, gzipped if the client accepts it."""
+    use_gzip = "gzip" in request.headers.get("accept-encoding", "")
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    headers = {"Content-Disposition": f'attachment; filename="items.{format}"'}
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return StreamingResponse(_stream_export(format, use_gzip), media_type=media_type, headers=headers)
+
+
+# ============================================================
+# 5. SEARCH
+# ============================================================
+# The search index answers from its own token -> items mapping, so a query
+# never scans fake_db. Try: /items/search?q=lap&prefix=true
+
+@app.get("/items/search")
+def search_items(q: str, prefix: bool = False, limit: int = 20):
+    """Find items whose name/description contain every word in `q`."""
+    names = search_index.search(q, prefix=prefix)
+    items = []
+    for name in names[:limit]:
+        item = fake_db.get(name)
+        if item is not None:  # skip an item deleted since the index was read
+            items.append(item)
+    return {"query": q, "total": len(names), "items": items}
+
+
+# ============================================================
+# 6. CHANGE FEED (SERVER-SENT EVENTS)
+# ============================================================
+# Instead of polling /items/, a client keeps one connection open and gets
+# an event for every create/update/delete. Browsers can use:
+#   new EventSource("/items/changes")
+# EventSource reconnects by itself and sends the Last-Event-ID header,
+# so it resumes exactly where it left off.
+
+SSE_KEEPALIVE_SECONDS = 15
+
+async def _change_stream(request, since):
+    sub, backlog, missed = change_broker.subscribe(since)
+    try:
+        yield "retry: 3000\n\n"
+        if missed:
+            # Older events are gone: tell the client to re-fetch the full state
+            yield f"event: reset\ndata: {json.dumps({'seq': change_broker.last_seq})}\n\n"
+        for event in backlog:
+            yield format_sse(event)
+        while True:
+            try:
+                event = await sub.get(timeout=SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                break  # fell too far behind; the client reconnects and resumes
+            yield format_sse(event)
+    finally:
+        change_broker.unsubscribe(sub)
+
+@app.get("/items/changes")
+async def item_changes(request: Request, since: Optional[int] = None):
+    """Stream item changes after sequence number `since` (default: from now on)."""
+    if since is None:
+        last_event_id = request.headers.get("last-event-id", "")
+        since = int(last_event_id) if last_event_id.isdigit() else change_broker.last_seq
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(_change_stream(request, since), media_type="text/event-stream", headers=headers)
+
+
+# ============================================================
+# 7. AGGREGATE STATISTICS
+# ============================================================
+# The handlers above keep running totals up to date, so this endpoint
+# costs the same whether the store holds ten items or ten million.
+
+@app.get("/items/stats")
+def item_statistics():
+    """Count, mean/std/min/max price and total tax over all items."""
+    return item_stats.snapshot()
+
+
+# ============================================================
+# 8. HOW TO TEST
 # ============================================================
 # When the server is running, FastAPI automatically generates 
 # interactive API documentation.
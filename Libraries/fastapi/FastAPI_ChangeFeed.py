@@ -0,0 +1,114 @@
+# ============================================================
+# FASTAPI: CHANGE FEED (IN-PROCESS BROADCAST)
+# ============================================================
+# Instead of clients polling for changes, every write publishes an event
+# to a broker, and each connected client has its own small queue.
+#
+# Key ideas:
+# 1. Every event gets an increasing sequence number. Clients remember the
+#    last one they saw and can resume from it after reconnecting.
+# 2. The broker keeps a bounded history (a deque) to replay from.
+# 3. Each subscriber queue is bounded. If a client cannot keep up, it is
+#    disconnected instead of making the writers wait; it then reconnects
+#    and catches up from the history.
+#
+# Sync FastAPI handlers run in a threadpool, so events are handed to the
+# event loop with loop.call_soon_threadsafe().
+# ============================================================
+
+import asyncio
+import json
+import threading
+from collections import deque
+
+
+class Subscriber:
+    """One connected client: a bounded queue living on an event loop."""
+
+    def __init__(self, loop, buffer_size):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=buffer_size)
+        self.overflowed = False
+        self.last_seq = 0
+
+    def _offer(self, event):
+        # Runs on the event loop thread
+        if self.overflowed or event["seq"] <= self.last_seq:
+            return
+        try:
+            self.queue.put_nowait(event)
+            self.last_seq = event["seq"]
+        except asyncio.QueueFull:
+            # Too slow: drop the client rather than block the writer
+            self.overflowed = True
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)  # wakes the reader up so it can close
+
+    async def get(self, timeout=None):
+        """Next event, None once overflowed; raises TimeoutError on timeout."""
+        if self.overflowed and self.queue.empty():
+            return None
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class ChangeBroker:
+    """Sequence-numbered publish/subscribe with a bounded replay history."""
+
+    def __init__(self, history_size=1000, buffer_size=100):
+        self.buffer_size = buffer_size
+        self._history = deque(maxlen=history_size)
+        self._subscribers = set()
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    @property
+    def last_seq(self):
+        return self._seq
+
+    def publish(self, kind, name, item=None):
+        """Record an event and fan it out. Never blocks on subscribers."""
+        with self._lock:
+            self._seq += 1
+            event = {"seq": self._seq, "type": kind, "name": name, "item": item}
+            self._history.append(event)
+            # Scheduled under the lock so every loop sees events in seq order
+            for sub in list(self._subscribers):
+                try:
+                    sub.loop.call_soon_threadsafe(sub._offer, event)
+                except RuntimeError:  # that client's event loop has shut down
+                    self._subscribers.discard(sub)
+        return event
+
+    def subscribe(self, since=0):
+        """Register a subscriber (must be called on its event loop).
+
+        Returns (subscriber, backlog, missed): `backlog` is the history newer
+        than `since`, to be sent before reading the subscriber's queue, and
+        `missed` is True if some events after `since` are no longer kept, or
+        if `since` is ahead of this broker (e.g. an id from before a restart).
+        """
+        sub = Subscriber(asyncio.get_running_loop(), self.buffer_size)
+        with self._lock:
+            if since > self._seq:
+                # Unknown future id: the client must re-fetch, then follow from now
+                sub.last_seq = self._seq
+                self._subscribers.add(sub)
+                return sub, [], True
+            backlog = [event for event in self._history if event["seq"] > since]
+            missed = bool(self._history) and since + 1 < self._history[0]["seq"]
+            # Live events up to here are covered by the backlog
+            sub.last_seq = backlog[-1]["seq"] if backlog else since
+            self._subscribers.add(sub)
+        return sub, backlog, missed
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def __len__(self):
+        return len(self._subscribers)
+
+
+def format_sse(event):
+    """Encode an event in the text/event-stream wire format."""
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
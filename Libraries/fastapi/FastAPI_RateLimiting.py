@@ -0,0 +1,208 @@
+# ============================================================
+# FASTAPI: TOKEN-BUCKET RATE LIMITING MIDDLEWARE
+# ============================================================
+# A token bucket gives every client a "bucket" that holds up to
+# `capacity` tokens and refills at `rate` tokens per second.
+# Each request spends one token; an empty bucket means HTTP 429.
+#
+# This is written as a *pure ASGI* middleware (not BaseHTTPMiddleware),
+# so an excess request is rejected before FastAPI does any routing,
+# body parsing or Pydantic validation.
+#
+# Two storage backends are provided:
+# 1. LocalBucketStore  - in-process dict, for a single worker
+# 2. SQLiteBucketStore - a shared SQLite file, for multi-worker setups
+#
+# Usage (see FastAPI_Basics.py):
+# app.add_middleware(TokenBucketMiddleware, rate=5, capacity=10)
+# ============================================================
+
+import asyncio
+import json
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+# ============================================================
+# 1. THE TOKEN BUCKET ALGORITHM
+# ============================================================
+
+def refill_and_take(tokens, last_seen, now, rate, capacity):
+    """Refill a bucket for the elapsed time and try to spend one token.
+
+    Returns (allowed, new_tokens, retry_after_seconds).
+    """
+    tokens = min(capacity, tokens + (now - last_seen) * rate)
+    if tokens >= 1:
+        return True, tokens - 1, 0.0
+    return False, tokens, (1 - tokens) / rate
+
+
+# ============================================================
+# 2. LOCAL (IN-PROCESS) BACKEND
+# ============================================================
+# Each active client costs one dict entry holding two floats, so memory
+# is O(1) per client. The OrderedDict is kept in least-recently-used
+# order, which lets idle clients be evicted from the front cheaply.
+
+class LocalBucketStore:
+    """Per-client token buckets kept in the current process."""
+
+    blocking = False
+
+    def __init__(self, rate, capacity, idle_ttl=300.0, max_clients=100_000):
+        self.rate = rate
+        self.capacity = capacity
+        self.idle_ttl = idle_ttl
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()  # key -> [tokens, last_seen]
+
+    def take(self, key, now=None):
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(self.capacity), now]
+            self._buckets[key] = bucket
+        else:
+            self._buckets.move_to_end(key)
+
+        allowed, bucket[0], retry_after = refill_and_take(
+            bucket[0], bucket[1], now, self.rate, self.capacity)
+        bucket[1] = now
+        self._evict(now)
+        return allowed, retry_after
+
+    def _evict(self, now):
+        """Drop idle clients (and the oldest ones if we are over the cap)."""
+        buckets = self._buckets
+        while buckets:
+            key, (_, last_seen) = next(iter(buckets.items()))
+            if now - last_seen < self.idle_ttl and len(buckets) <= self.max_clients:
+                break
+            del buckets[key]
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+# ============================================================
+# 3. SHARED SQLITE BACKEND (MULTI-WORKER)
+# ============================================================
+# When uvicorn/gunicorn runs several worker processes, each would have its
+# own LocalBucketStore and a client could get `capacity` x workers requests.
+# Pointing every worker at the same SQLite file shares the buckets.
+# BEGIN IMMEDIATE takes the write lock up front, so the read-modify-write
+# of a bucket is atomic across processes.
+
+class SQLiteBucketStore:
+    """Per-client token buckets shared between processes via SQLite."""
+
+    blocking = True
+
+    def __init__(self, path, rate, capacity, idle_ttl=300.0, evict_every=1000):
+        self.path = path
+        self.rate = rate
+        self.capacity = capacity
+        self.idle_ttl = idle_ttl
+        self.evict_every = evict_every
+        self._calls = 0
+        # One connection per process, shared by the threadpool, so guard it
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            " key TEXT PRIMARY KEY, tokens REAL NOT NULL, last_seen REAL NOT NULL)")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS buckets_last_seen ON buckets(last_seen)")
+
+    def take(self, key, now=None):
+        # Wall-clock time, because the buckets are shared between processes
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._take_locked(key, now)
+
+    def _take_locked(self, key, now):
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, last_seen FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens, last_seen = row if row else (float(self.capacity), now)
+            allowed, tokens, retry_after = refill_and_take(
+                tokens, last_seen, now, self.rate, self.capacity)
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, last_seen) VALUES (?, ?, ?)",
+                (key, tokens, now))
+
+            # Periodically clear out clients that have gone idle
+            self._calls += 1
+            if self._calls % self.evict_every == 0:
+                conn.execute("DELETE FROM buckets WHERE last_seen < ?", (now - self.idle_ttl,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, retry_after
+
+    def close(self):
+        self._conn.close()
+
+
+# ============================================================
+# 4. THE ASGI MIDDLEWARE
+# ============================================================
+
+def client_ip(scope):
+    """Default key function: the remote address of the connection."""
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class TokenBucketMiddleware:
+    """Reject requests over the per-client rate with 429 before routing."""
+
+    def __init__(self, app, rate=5.0, capacity=10, store=None, key_func=client_ip,
+                 exempt_paths=("/docs", "/redoc", "/openapi.json")):
+        self.app = app
+        self.store = store if store is not None else LocalBucketStore(rate, capacity)
+        self.key_func = key_func
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope, receive, send):
+        # Only HTTP requests are limited; lifespan/websocket events pass through
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        key = self.key_func(scope)
+        if self.store.blocking:
+            # Keep SQLite I/O off the event loop
+            allowed, retry_after = await asyncio.to_thread(self.store.take, key)
+        else:
+            allowed, retry_after = self.store.take(key)
+
+        if allowed:
+            await self.app(scope, receive, send)
+        else:
+            await self._reject(send, retry_after)
+
+    @staticmethod
+    async def _reject(send, retry_after):
+        # The request body is never read, so it is never parsed
+        body = json.dumps({"detail": "Too Many Requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,161 @@
+# ============================================================
+# FASTAPI: FULL-TEXT AND PREFIX SEARCH INDEX
+# ============================================================
+# Searching by scanning every item in the store is O(items) per query.
+# Instead we keep two small indexes up to date on every write:
+#
+# 1. An inverted index:  token -> set of item keys containing it
+# 2. A prefix index:     a trie (one nested dict per character) of all
+#                        distinct tokens, so every token starting with
+#                        "lap" sits below the node reached by l -> a -> p
+#
+# Adding, updating or removing an item only touches that item's own
+# tokens, and a token is added to or removed from the trie in O(its
+# length), so the cost of a write is O(characters in the item), not
+# O(store) or O(distinct tokens).
+#
+# Usage (see FastAPI_Basics.py):
+# index = SearchIndex(fields=("name", "description"))
+# index.add("laptop", {"name": "Laptop", "description": "Fast and light"})
+# index.search("fast lap", prefix=True)  ->  ["laptop"]
+# ============================================================
+
+import re
+import threading
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class _PrefixTrie:
+    """Set of tokens that can list every token starting with a prefix."""
+
+    _END = None  # key marking "a token ends here"; real keys are characters
+
+    def __init__(self):
+        self._root = {}
+
+    def add(self, token):
+        node = self._root
+        for char in token:
+            node = node.setdefault(char, {})
+        node[self._END] = True
+
+    def discard(self, token):
+        # Walk down remembering the path, then prune nodes left empty
+        path = [self._root]
+        for char in token:
+            node = path[-1].get(char)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].pop(self._END, None)
+        for depth in range(len(token) - 1, -1, -1):
+            if path[depth + 1]:
+                break  # still leads to other tokens
+            del path[depth][token[depth]]
+
+    def with_prefix(self, prefix):
+        """Yield every token starting with `prefix`."""
+        node = self._root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return
+        stack = [(prefix, node)]
+        while stack:
+            token, node = stack.pop()
+            for char, child in node.items():
+                if char is self._END:
+                    yield token
+                else:
+                    stack.append((token + char, child))
+
+
+class SearchIndex:
+    """Inverted index plus prefix trie, maintained incrementally."""
+
+    def __init__(self, fields=("name", "description")):
+        self.fields = fields
+        self._postings = {}       # token -> set of keys
+        self._prefixes = _PrefixTrie()  # every token in _postings
+        self._doc_tokens = {}     # key -> frozenset of its tokens (needed for removal)
+        # Sync FastAPI handlers run in a threadpool, so writes can overlap
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------
+
+    def add(self, key, doc):
+        """Index a document, replacing any previous version under the same key."""
+        tokens = frozenset(
+            token for field in self.fields for token in tokenize(doc.get(field)))
+        with self._lock:
+            old_tokens = self._doc_tokens.get(key, frozenset())
+
+            # Only the difference between the old and new token sets is touched
+            for token in old_tokens - tokens:
+                self._remove_posting(token, key)
+            for token in tokens - old_tokens:
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = set()
+                    self._prefixes.add(token)
+                postings.add(key)
+            self._doc_tokens[key] = tokens
+
+    def remove(self, key):
+        """Remove a document from the index (a no-op if it is not indexed)."""
+        with self._lock:
+            for token in self._doc_tokens.pop(key, ()):
+                self._remove_posting(token, key)
+
+    def _remove_posting(self, token, key):
+        postings = self._postings[token]
+        postings.discard(key)
+        if not postings:
+            del self._postings[token]
+            self._prefixes.discard(token)
+
+    # ------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------
+
+    def keys_with_prefix(self, prefix):
+        """Union of the postings of every token starting with `prefix`."""
+        keys = set()
+        for token in self._prefixes.with_prefix(prefix):
+            keys |= self._postings[token]
+        return keys
+
+    def search(self, query, prefix=False):
+        """Return the sorted keys of documents containing every query token.
+
+        With prefix=True the last token only needs to be the start of a word,
+        which is what a search-as-you-type box wants.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        with self._lock:
+            candidate_sets = [self._postings.get(term, set()) for term in terms]
+            if prefix:
+                candidate_sets[-1] = self.keys_with_prefix(terms[-1])
+
+            # Intersect starting from the smallest set to keep the work minimal
+            candidate_sets.sort(key=len)
+            result = set(candidate_sets[0])
+            for keys in candidate_sets[1:]:
+                if not result:
+                    break
+                result &= keys
+        return sorted(result)
+
+    def __len__(self):
+        return len(self._doc_tokens)
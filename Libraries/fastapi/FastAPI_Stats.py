@@ -0,0 +1,123 @@
+# ============================================================
+# FASTAPI: RUNNING AGGREGATE STATISTICS
+# ============================================================
+# "How many items, what is the average price, how much tax in total?"
+# could be answered by looping over the whole store on every request,
+# but that gets slower as the store grows.
+#
+# Instead we keep running totals that every write adjusts:
+#   count, sum(price), sum(price^2), sum(tax)
+# Mean and standard deviation follow directly from those sums:
+#   mean = sum / n        variance = sum_sq / n - mean^2
+#
+# In floating point both formulas go wrong: the variance cancels
+# catastrophically when the prices are large and close together, and a
+# running sum never recovers from rounding (add 1e20, add 1, remove 1e20
+# leaves 0, not 1). Every float is an exact fraction with a power-of-two
+# denominator, so the sums are kept as exact Fractions instead: adding and
+# removing cancel exactly, and the only rounding is the final conversion
+# of each statistic to a float.
+#
+# Min/max are the tricky part, because deleting the current minimum
+# means we need the *next* smallest price. A heap with lazy deletion
+# handles that in O(log n) per write, while reads stay O(1).
+# ============================================================
+
+import heapq
+import math
+import threading
+from collections import Counter
+from fractions import Fraction
+
+
+class RunningStats:
+    """Incrementally maintained price/tax statistics for the item store."""
+
+    def __init__(self):
+        self.count = 0
+        self.price_sum = Fraction(0)     # exact, see the header
+        self.price_sum_sq = Fraction(0)
+        self.tax_sum = Fraction(0)
+        self.taxed_count = 0
+        self._price_counts = Counter()  # price -> number of items with that price
+        self._min_heap = []
+        self._max_heap = []             # negated prices
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------
+    # Writes: O(log n) because of the heaps, everything else is O(1)
+    # ------------------------------------------------------------
+
+    def add(self, item):
+        with self._lock:
+            self._apply(item, +1)
+
+    def remove(self, item):
+        with self._lock:
+            self._apply(item, -1)
+
+    def replace(self, old_item, new_item):
+        """Swap one item for another (old_item may be None for a new key)."""
+        with self._lock:
+            if old_item is not None:
+                self._apply(old_item, -1)
+            self._apply(new_item, +1)
+
+    def _apply(self, item, sign):
+        price = item["price"]
+        tax = item.get("tax")
+        exact_price = Fraction(price)
+        self.count += sign
+        self.price_sum += sign * exact_price
+        self.price_sum_sq += sign * exact_price * exact_price
+        if tax:
+            self.tax_sum += sign * Fraction(tax)
+            self.taxed_count += sign
+
+        counts = self._price_counts
+        if sign > 0:
+            if counts[price] == 0:
+                heapq.heappush(self._min_heap, price)
+                heapq.heappush(self._max_heap, -price)
+            counts[price] += 1
+        else:
+            counts[price] -= 1
+            if counts[price] == 0:
+                del counts[price]
+            self._prune()
+
+    def _prune(self):
+        """Pop heap tops that no longer exist, and compact stale heaps."""
+        counts = self._price_counts
+        while self._min_heap and self._min_heap[0] not in counts:
+            heapq.heappop(self._min_heap)
+        while self._max_heap and -self._max_heap[0] not in counts:
+            heapq.heappop(self._max_heap)
+        if len(self._min_heap) > 2 * len(counts) + 64:
+            self._min_heap = list(counts)
+            heapq.heapify(self._min_heap)
+            self._max_heap = [-price for price in counts]
+            heapq.heapify(self._max_heap)
+
+    # ------------------------------------------------------------
+    # Reads: O(1), independent of the number of items
+    # ------------------------------------------------------------
+
+    def snapshot(self):
+        with self._lock:
+            n = self.count
+            if n == 0:
+                return {"count": 0, "total_price": 0.0, "mean_price": None, "std_price": None,
+                        "min_price": None, "max_price": None, "total_tax": 0.0, "taxed_count": 0}
+            mean = self.price_sum / n
+            variance = self.price_sum_sq / n - mean * mean  # exact, so never negative
+            return {
+                "count": n,
+                "total_price": float(self.price_sum),
+                "mean_price": float(mean),
+                "std_price": math.sqrt(variance),
+                "min_price": self._min_heap[0],
+                "max_price": -self._max_heap[0],
+                "total_tax": float(self.tax_sum),
+                "taxed_count": self.taxed_count,
+            }
@@ -0,0 +1,129 @@
+# =============================================================================
+# PANDAS - OUT-OF-CORE HELPERS
+# =============================================================================
+# Shared by the projects that process files too large to load at once
+# (Projects/ML_Project: streaming training, batch scoring, drift monitoring;
+# Projects/EDA_Project: out-of-core summary statistics):
+#   - read_chunks(): a CSV or Parquet file as a sequence of DataFrames
+#   - TDigest:       a mergeable sketch of a numeric distribution, for
+#                    approximate quantiles and CDFs in constant memory
+#
+# Usage in a script in one of the projects:
+#   sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Libraries', 'pandas'))
+#   from Pandas_OutOfCore import read_chunks, TDigest
+# =============================================================================
+
+import math
+
+import numpy as np
+import pandas as pd
+
+
+def read_chunks(path, chunk_size=50_000):
+    """Yield DataFrames of at most `chunk_size` rows from a CSV or Parquet file."""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq  # optional dependency, only needed for Parquet
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class TDigest:
+    """Mergeable approximation of a numeric distribution.
+
+    Incoming values are buffered; on compression all points are sorted and
+    grouped so that no group spans more than one unit of the scale
+    function k(q) = compression / (2 pi) * asin(2q - 1). k changes fastest
+    near q = 0 and q = 1, so centroids there hold few points and the tails
+    stay precise.
+    """
+
+    def __init__(self, compression=200, buffer_size=1000):
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer_means = []
+        self._buffer_weights = []
+        self._buffered = 0
+
+    @property
+    def count(self):
+        self._compress()
+        return float(self.weights.sum())
+
+    def update(self, values, weights=None):
+        values = np.asarray(values, dtype=float)
+        keep = ~np.isnan(values)
+        values = values[keep]
+        if not len(values):
+            return self
+        weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=float)[keep]
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._buffer_means.append(values)
+        self._buffer_weights.append(weights)
+        self._buffered += len(values)
+        if self._buffered >= self.buffer_size:
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """Add another digest's centroids into this one."""
+        other._compress()
+        if len(other.means):
+            self.update(other.means, other.weights)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        return self
+
+    def _compress(self):
+        if not self._buffered:
+            return
+        means = np.concatenate([self.means, *self._buffer_means])
+        weights = np.concatenate([self.weights, *self._buffer_weights])
+        self._buffer_means, self._buffer_weights, self._buffered = [], [], 0
+
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        k = np.floor(self.compression / (2 * math.pi) * np.arcsin(2 * q - 1))
+        starts = np.flatnonzero(np.diff(k, prepend=k[0] - 1))
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def _curve(self):
+        """(values, cumulative fractions) through the centroids, min and max."""
+        self._compress()
+        cumulative = np.cumsum(self.weights)
+        mid = (cumulative - self.weights / 2) / cumulative[-1]
+        return np.r_[self.min, self.means, self.max], np.r_[0.0, mid, 1.0]
+
+    def cdf(self, x):
+        if not len(self.weights) and not self._buffered:
+            return np.full(np.shape(x), np.nan)
+        values, fractions = self._curve()
+        return np.interp(x, values, fractions)
+
+    def quantile(self, q):
+        if not len(self.weights) and not self._buffered:
+            return np.full(np.shape(q), np.nan)
+        values, fractions = self._curve()
+        return np.interp(q, fractions, values)
+
+    def to_dict(self):
+        self._compress()
+        return {'compression': self.compression, 'min': self.min, 'max': self.max,
+                'means': self.means.tolist(), 'weights': self.weights.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        digest = cls(data['compression'])
+        digest.means = np.array(data['means'], dtype=float)
+        digest.weights = np.array(data['weights'], dtype=float)
+        digest.min, digest.max = data['min'], data['max']
+        return digest
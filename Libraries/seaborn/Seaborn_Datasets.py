@@ -0,0 +1,205 @@
+# =============================================================================
+# SEABORN DATASETS - OFFLINE, COLUMNAR CACHE
+# =============================================================================
+# sns.load_dataset('titanic') downloads a CSV from GitHub the first time and
+# parses it as text every time. That needs a network connection and is slow.
+#
+# load_dataset() below is a drop-in replacement:
+#   - the first call gets the data (seaborn's CSV cache, or the network)
+#   - it applies the final dtypes once (e.g. categoricals for sex/embarked,
+#     with their categories in order of appearance, so plots colour and
+#     order them exactly as they did with plain text columns)
+#   - and stores the result in a binary columnar file (Feather, or a pickle
+#     when pyarrow is not installed)
+# Every later call just reads that file: milliseconds, no network. A small
+# manifest next to it pins the row count, dtypes and a hash of the data;
+# a file that no longer matches it is rebuilt.
+#
+# Prefetch everything once while online:
+#   python Seaborn_Datasets.py
+#
+# Usage in a script next to this file:
+#   from Seaborn_Datasets import load_dataset
+#   tips = load_dataset('tips')
+# =============================================================================
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+
+import pandas as pd
+import seaborn as sns
+
+CACHE_DIR = os.environ.get(
+    'SEABORN_DATASET_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'python_mastery', 'datasets'))
+
+# The datasets used across the tutorials and projects
+DATASETS = ['titanic', 'tips', 'penguins', 'flights', 'fmri', 'iris']
+
+# Columns stored as categoricals: smaller in memory and faster to group by.
+# (seaborn already makes some of these categorical; the rest are added here.)
+CATEGORICAL_COLUMNS = {
+    'titanic': ['sex', 'embarked', 'class', 'who', 'deck', 'embark_town', 'alive'],
+    'tips': ['sex', 'smoker', 'day', 'time'],
+    'penguins': ['species', 'island', 'sex'],
+    'flights': ['month'],
+    'fmri': ['subject', 'event', 'region'],
+    'iris': ['species'],
+}
+
+# Bump when the way the cache is built changes, so old caches are rebuilt
+CACHE_VERSION = 2
+
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = 'feather'
+except ImportError:
+    CACHE_FORMAT = 'pickle'
+
+
+# =============================================================================
+# 1. CACHE FILES
+# =============================================================================
+
+def _cache_path(name):
+    return os.path.join(CACHE_DIR, f'{name}.{CACHE_FORMAT}')
+
+
+def _manifest_path(name):
+    return os.path.join(CACHE_DIR, f'{name}.json')
+
+
+def _data_sha256(df):
+    return hashlib.sha256(pd.util.hash_pandas_object(df, index=False).values.tobytes()).hexdigest()
+
+
+def _dtypes(df):
+    return {column: str(dtype) for column, dtype in df.dtypes.items()}
+
+
+def _write_cache(name, df, source):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _cache_path(name)
+    tmp_path = path + '.tmp'
+    if CACHE_FORMAT == 'feather':
+        df.reset_index(drop=True).to_feather(tmp_path)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)  # atomic, so readers never see half a file
+
+    # The manifest pins what the cache was built from
+    manifest = {
+        'name': name,
+        'cache_version': CACHE_VERSION,
+        'rows': len(df),
+        'columns': _dtypes(df),
+        'categories': {column: df[column].cat.categories.tolist()
+                       for column in df.columns if isinstance(df[column].dtype, pd.CategoricalDtype)},
+        'source': source,
+        'data_sha256': _data_sha256(df),
+        'seaborn_version': sns.__version__,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    with open(_manifest_path(name), 'w') as f:
+        json.dump(manifest, f, indent=2, default=str)
+
+
+def _read_cache(name):
+    """The cached frame, or None if it is missing or does not match its manifest."""
+    try:
+        with open(_manifest_path(name)) as f:
+            manifest = json.load(f)
+        path = _cache_path(name)
+        df = pd.read_feather(path) if CACHE_FORMAT == 'feather' else pd.read_pickle(path)
+    except (OSError, ValueError, EOFError, pickle.UnpicklingError):  # missing or corrupt
+        return None
+    categories = {column: df[column].cat.categories.tolist()
+                  for column in df.columns if isinstance(df[column].dtype, pd.CategoricalDtype)}
+    if (manifest.get('cache_version') != CACHE_VERSION
+            or manifest.get('rows') != len(df)
+            or manifest.get('columns') != _dtypes(df)
+            or json.loads(json.dumps(categories, default=str)) != manifest.get('categories')
+            or manifest.get('data_sha256') != _data_sha256(df)):
+        return None
+    return df
+
+
+# =============================================================================
+# 2. LOADING
+# =============================================================================
+
+def _fetch(name):
+    """Get the raw dataset, preferring seaborn's local CSV cache over the network."""
+    seaborn_csv = os.path.join(sns.get_data_home(), f'{name}.csv')
+    source = 'seaborn-cache' if os.path.exists(seaborn_csv) else 'network'
+    try:
+        return sns.load_dataset(name), source
+    except OSError as exc:  # URLError is an OSError
+        raise RuntimeError(
+            f"Dataset '{name}' is not cached and could not be downloaded ({exc}). "
+            f"Run 'python Seaborn_Datasets.py' once while online.") from exc
+
+
+def _apply_dtypes(name, df):
+    for column in CATEGORICAL_COLUMNS.get(name, []):
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            # Categories in order of appearance, the order seaborn uses for
+            # text columns; astype('category') would sort them instead
+            df[column] = pd.Categorical(df[column], categories=pd.unique(df[column].dropna()))
+    return df
+
+
+def load_dataset(name, refresh=False):
+    """Like sns.load_dataset(name), but served from a local columnar cache.
+
+    The cache is checked against its manifest (row count, dtypes, categories
+    and a hash of the data) and rebuilt if anything differs.
+    """
+    if not refresh:
+        df = _read_cache(name)
+        if df is not None:
+            return df
+    df, source = _fetch(name)
+    df = _apply_dtypes(name, df)
+    _write_cache(name, df, source)
+    return df
+
+
+def dataset_names():
+    """sns.get_dataset_names(), or the cached datasets when offline."""
+    try:
+        return sns.get_dataset_names()
+    except OSError:
+        if not os.path.isdir(CACHE_DIR):
+            return []
+        suffix = f'.{CACHE_FORMAT}'
+        return sorted(f[:-len(suffix)] for f in os.listdir(CACHE_DIR) if f.endswith(suffix))
+
+
+def prefetch(names=DATASETS):
+    """Fill the cache for all datasets (needs the network only once)."""
+    for name in names:
+        load_dataset(name)
+
+
+# =============================================================================
+# 3. PREFETCH AND TIMING
+# =============================================================================
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or DATASETS
+    prefetch(names)
+    print(f"Cache: {CACHE_DIR} ({CACHE_FORMAT})\n")
+    print(f"{'dataset':<10}{'rows':>8}{'cached load (ms)':>18}{'sns.load_dataset (ms)':>23}")
+    for name in names:
+        start = time.perf_counter()
+        df = load_dataset(name)
+        cached_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        sns.load_dataset(name)  # seaborn's CSV path (parsing; network if not cached)
+        csv_ms = (time.perf_counter() - start) * 1000
+        print(f"{name:<10}{len(df):>8}{cached_ms:>18.2f}{csv_ms:>23.2f}")
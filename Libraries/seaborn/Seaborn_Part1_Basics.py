@@ -9,6 +9,8 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
+from Seaborn_Datasets import load_dataset, dataset_names  # offline cache for sns.load_dataset
+
 # =============================================================================
 # 1. GETTING STARTED
 # =============================================================================
@@ -31,18 +33,19 @@ print("--- Built-in Datasets ---")
 
 # Seaborn comes with sample datasets for practice
 print("\nAvailable datasets:")
-print(sns.get_dataset_names())
+print(dataset_names())
 
-# Load a dataset
-tips = sns.load_dataset('tips')
+# Load a dataset (sns.load_dataset downloads it; load_dataset from
+# Seaborn_Datasets.py keeps a local binary copy, so it also works offline)
+tips = load_dataset('tips')
 print("\nTips dataset:")
 print(tips.head())
 print("\nShape:", tips.shape)
 
 # Other useful datasets
-iris = sns.load_dataset('iris')
-titanic = sns.load_dataset('titanic')
-penguins = sns.load_dataset('penguins')
+iris = load_dataset('iris')
+titanic = load_dataset('titanic')
+penguins = load_dataset('penguins')
 
 # =============================================================================
 # 3. SETTING STYLE AND THEMES
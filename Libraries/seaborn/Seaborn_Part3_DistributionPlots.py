@@ -9,12 +9,14 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
+from Seaborn_Datasets import load_dataset  # offline cache for sns.load_dataset
+
 # Set theme
 sns.set_theme(style="whitegrid")
 
 # Load datasets
-tips = sns.load_dataset('tips')
-penguins = sns.load_dataset('penguins').dropna()
+tips = load_dataset('tips')
+penguins = load_dataset('penguins').dropna()
 
 print("Tips dataset preview:")
 print(tips.head())
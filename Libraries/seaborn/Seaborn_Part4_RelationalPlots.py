@@ -8,9 +8,11 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
+from Seaborn_Datasets import load_dataset  # offline cache for sns.load_dataset
+
 sns.set_theme(style="whitegrid")
-tips = sns.load_dataset('tips')
-fmri = sns.load_dataset('fmri')
+tips = load_dataset('tips')
+fmri = load_dataset('fmri')
 
 # =============================================================================
 # 1. SCATTER PLOT
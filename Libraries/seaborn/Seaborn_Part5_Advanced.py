@@ -8,10 +8,12 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
+from Seaborn_Datasets import load_dataset  # offline cache for sns.load_dataset
+
 sns.set_theme(style="whitegrid")
-tips = sns.load_dataset('tips')
-flights = sns.load_dataset('flights')
-penguins = sns.load_dataset('penguins').dropna()
+tips = load_dataset('tips')
+flights = load_dataset('flights')
+penguins = load_dataset('penguins').dropna()
 
 # =============================================================================
 # 1. HEATMAP
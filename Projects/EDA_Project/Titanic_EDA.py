@@ -1,88 +1,218 @@
 """
 Titanic_EDA.py
-A Capstone Mini-Project performing Exploratory Data Analysis (EDA) 
+A Capstone Mini-Project performing Exploratory Data Analysis (EDA)
 using Pandas, Matplotlib, and Seaborn.
+
+Run: python Titanic_EDA.py                  (interactive windows)
+     python Titanic_EDA.py --report DIR     (headless: PNG/SVG files, rendered
+                                             in parallel, see Titanic_EDA_Report.py)
+     python Titanic_EDA.py --refresh        (ignore the report cache, see
+                                             Titanic_EDA_Cache.py)
+     python Titanic_EDA.py --data FILE      (a CSV/Parquet file with the same
+                                             columns instead of the seaborn copy)
 """
 
+import argparse
+import io
+import os
+import sys
+import time
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-def main():
-    print("=== TITANIC EXPLORATORY DATA ANALYSIS (EDA) ===")
-    
-    # 1. Load Dataset
-    # Seaborn has built-in datasets for practice
-    print("Loading Titanic Dataset...")
-    df = sns.load_dataset('titanic')
-    
-    # 2. Basic Inspection
-    print("\n--- First 5 Rows ---")
-    print(df.head())
-    
-    print("\n--- Dataset Info ---")
-    print(df.info())
-    
-    print("\n--- Missing Values ---")
-    print(df.isnull().sum())
-    
-    # 3. Data Cleaning
-    print("\n--- Cleaning Data ---")
+# The offline dataset cache lives next to the seaborn tutorials
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Libraries', 'seaborn'))
+from Seaborn_Datasets import load_dataset  # noqa: E402
+from Titanic_EDA_Aggregates import count_table, histogram_table, mean_table  # noqa: E402
+from Titanic_EDA_Aggregates import plot_counts, plot_histogram, plot_means  # noqa: E402
+from Titanic_EDA_Cache import ReportCache, dataset_fingerprint, file_fingerprint  # noqa: E402
+
+# Parameters of the analysis. Each cached section is keyed by the ones it
+# uses, so changing e.g. the confidence level only recomputes the overview.
+PARAMS = {
+    'cleaning': {'drop_columns': ['deck'], 'fill_age': 'median'},
+    'overview': {'bins': 'auto', 'confidence': 0.95},
+    'correlation': {'method': 'pearson'},
+}
+
+
+# --- Statistics ---
+
+def inspect(df):
+    info = io.StringIO()
+    df.info(buf=info)
+    return {'head': df.head(), 'info': info.getvalue(), 'missing': df.isnull().sum()}
+
+
+def clean(df, drop_columns, fill_age):
+    df = df.copy()
     # 'deck' has too many missing values, let's drop the column
-    df.drop('deck', axis=1, inplace=True)
+    df.drop(drop_columns, axis=1, inplace=True)
     # Fill missing ages with the median age
-    df['age'] = df['age'].fillna(df['age'].median())
+    df['age'] = df['age'].fillna(df['age'].agg(fill_age))
     # Drop remaining rows with missing values (e.g., embarked)
     df.dropna(inplace=True)
-    print("Remaining Missing Values:", df.isnull().sum().sum())
-    
-    # 4. Statistical Summary
-    print("\n--- Statistical Summary ---")
-    print(df.describe())
-    
-    # 5. Visualizations
-    print("\n--- Generating Visualizations ---")
-    # Set the style
-    sns.set_theme(style="whitegrid")
-    
+    return df
+
+
+def summarize(df):
+    return {'remaining_missing': int(df.isnull().sum().sum()), 'describe': df.describe()}
+
+
+# --- Figures ---
+# Each figure is drawn from small aggregate tables prepared by its *_data()
+# function (see Titanic_EDA_Aggregates.py), so drawing costs the same for any number
+# of rows and a figure can be rendered in a separate process.
+
+def overview_data(df, bins, confidence):
+    return {
+        'survived': count_table(df, 'survived'),
+        'survived_by_sex': count_table(df, 'survived', hue='sex'),
+        'age': histogram_table(df, 'age', hue='survived', bins=bins),
+        'class': mean_table(df, 'pclass', 'survived', confidence=confidence),
+    }
+
+
+def correlation_data(df, method):
+    # Select only numerical columns for correlation
+    return df.select_dtypes(include=[np.number]).corr(method=method)
+
+
+def draw_overview(tables):
     # Create a figure with subplots
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
     fig.suptitle('Titanic Dataset Exploratory Data Analysis', fontsize=16)
-    
+
     # Plot 1: Survival Count
-    sns.countplot(data=df, x='survived', ax=axes[0, 0], palette='pastel')
+    plot_counts(tables['survived'], 'survived', ax=axes[0, 0], palette='pastel')
     axes[0, 0].set_title('Survival Count (0 = No, 1 = Yes)')
     axes[0, 0].set_xticklabels(['Did Not Survive', 'Survived'])
-    
+
     # Plot 2: Survival by Gender
-    sns.countplot(data=df, x='survived', hue='sex', ax=axes[0, 1], palette='Set2')
+    plot_counts(tables['survived_by_sex'], 'survived', hue='sex', ax=axes[0, 1], palette='Set2')
     axes[0, 1].set_title('Survival by Gender')
     axes[0, 1].set_xticklabels(['Did Not Survive', 'Survived'])
-    
+
     # Plot 3: Age Distribution by Survival
-    sns.histplot(data=df, x='age', hue='survived', kde=True, ax=axes[1, 0], palette='Set1', alpha=0.6)
+    plot_histogram(tables['age'], 'age', 'survived', ax=axes[1, 0], palette='Set1', alpha=0.6)
     axes[1, 0].set_title('Age Distribution grouped by Survival')
-    
+
     # Plot 4: Survival by Passenger Class
-    sns.barplot(data=df, x='pclass', y='survived', ax=axes[1, 1], palette='Blues_d')
+    plot_means(tables['class'], 'pclass', 'survived', ax=axes[1, 1], palette='Blues_d')
     axes[1, 1].set_title('Survival Rate by Passenger Class')
     axes[1, 1].set_ylabel('Survival Probability')
-    
-    plt.tight_layout()
+
+    fig.tight_layout()
+    return fig
+
+
+def draw_correlation(corr_matrix):
+    fig = plt.figure(figsize=(8, 6))
+    sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', fmt=".2f", vmin=-1, vmax=1)
+    plt.title('Correlation Matrix of Numeric Features')
+    fig.tight_layout()
+    return fig
+
+
+FIGURES = {'overview': draw_overview, 'correlation': draw_correlation}
+FIGURE_DATA = {'overview': overview_data, 'correlation': correlation_data}
+
+
+def read_table(path):
+    """A CSV or Parquet file as a DataFrame."""
+    return pd.read_parquet(path) if path.endswith('.parquet') else pd.read_csv(path)
+
+
+def main(report_dir=None, refresh=False, data_path=None):
+    print("=== TITANIC EXPLORATORY DATA ANALYSIS (EDA) ===")
+
+    # 1. Load Dataset
+    frames = {}
+    if data_path is None:
+        # Seaborn has built-in datasets for practice; a local binary copy loads
+        # in milliseconds and without a network connection
+        print("Loading Titanic Dataset...")
+        start = time.perf_counter()
+        frames['raw'] = load_dataset('titanic')
+        print(f"Loaded {len(frames['raw'])} rows in {(time.perf_counter() - start) * 1000:.1f} ms")
+        fingerprint = dataset_fingerprint(frames['raw'])
+    else:
+        # A file is fingerprinted by its path, size and modification time,
+        # so it is only read if some section below is not cached
+        fingerprint = file_fingerprint(data_path)
+
+    def raw_df():
+        if 'raw' not in frames:
+            print(f"Loading '{data_path}'...")
+            frames['raw'] = read_table(data_path)
+        return frames['raw']
+
+    # Every section below is read from the report cache when neither the
+    # data nor the parameters it depends on have changed
+    cache = ReportCache(refresh=refresh)
+    print(f"Dataset fingerprint: {fingerprint}")
+
+    # 2. Basic Inspection
+    inspection = cache.get_or_compute('inspection', fingerprint, None, lambda: inspect(raw_df()))
+    print("\n--- First 5 Rows ---")
+    print(inspection['head'])
+
+    print("\n--- Dataset Info ---")
+    print(inspection['info'])
+
+    print("\n--- Missing Values ---")
+    print(inspection['missing'])
+
+    # 3. Data Cleaning
+    # Only done if a section that needs the cleaned rows is not cached
+    def cleaned_df():
+        if 'cleaned' not in frames:
+            frames['cleaned'] = clean(raw_df(), **PARAMS['cleaning'])
+        return frames['cleaned']
+
+    summary = cache.get_or_compute('summary', fingerprint, {'cleaning': PARAMS['cleaning']},
+                                   lambda: summarize(cleaned_df()))
+    print("\n--- Cleaning Data ---")
+    print("Remaining Missing Values:", summary['remaining_missing'])
+
+    # 4. Statistical Summary
+    print("\n--- Statistical Summary ---")
+    print(summary['describe'])
+
+    # 5. Visualizations
+    print("\n--- Generating Visualizations ---")
+    data, keys = {}, {}
+    for name, compute in FIGURE_DATA.items():
+        params = {'cleaning': PARAMS['cleaning'], **PARAMS[name]}
+        data[name] = cache.get_or_compute(name, fingerprint, params,
+                                          lambda compute=compute, name=name: compute(cleaned_df(), **PARAMS[name]))
+        keys[name] = cache.key(name, fingerprint, params)
+    print(f"Report cache: {cache.summary()}")
+
+    if report_dir is not None:
+        # Headless: every changed figure rendered to files in its own process
+        from Titanic_EDA_Report import render_report, print_render_summary
+        print_render_summary(render_report(data, report_dir, keys=keys, force=refresh))
+        return
+
+    # Set the style
+    sns.set_theme(style="whitegrid")
+    draw_overview(data['overview'])
     plt.show()
 
     # Correlation Matrix Heatmap
     print("Generating Correlation Heatmap...")
-    plt.figure(figsize=(8, 6))
-    # Select only numerical columns for correlation
-    numeric_df = df.select_dtypes(include=[np.number])
-    corr_matrix = numeric_df.corr()
-    
-    sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', fmt=".2f", vmin=-1, vmax=1)
-    plt.title('Correlation Matrix of Numeric Features')
-    plt.tight_layout()
+    draw_correlation(data['correlation'])
     plt.show()
 
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Titanic exploratory data analysis")
+    parser.add_argument('--report', metavar='DIR', help="write the figures to DIR instead of showing them")
+    parser.add_argument('--refresh', action='store_true', help="recompute every section, ignoring the cache")
+    parser.add_argument('--data', metavar='FILE', help="analyse this CSV/Parquet file instead of the seaborn copy")
+    args = parser.parse_args()
+    main(args.report, args.refresh, args.data)
@@ -0,0 +1,106 @@
+"""
+Titanic_EDA_Cache.py
+A disk cache for the sections of the EDA report.
+
+Rerunning Titanic_EDA.py on the same data used to redo every step: the
+inspection tables, the cleaning, the statistical summary and the figure
+aggregates. This module stores each section's result on disk, under a key
+made of
+  - a fingerprint of the dataset: its schema (column names and dtypes),
+    its number of rows and a hash of a fixed sample of rows; for a file
+    (python Titanic_EDA.py --data FILE), its path, size and modification
+    time, so a fully cached rerun does not even read the file
+  - the analysis parameters that section uses, e.g. the histogram bins
+    or the confidence level
+  - the section's name and a version number, bumped when the code that
+    computes a section changes
+A rerun on unchanged data reads every section back from disk. Change a
+parameter and only the sections that use it are recomputed.
+
+The sampled fingerprint does not read every row, so an edit that touches
+none of the sampled rows and keeps the row count goes unnoticed. Pass
+refresh=True (python Titanic_EDA.py --refresh) after editing data in place.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = os.path.join('.cache', 'eda_report')
+CACHE_VERSION = 1
+SAMPLE_ROWS = 1024
+
+
+def dataset_fingerprint(df, sample_rows=SAMPLE_ROWS):
+    """Schema, length and the hashes of evenly spaced rows (first and last included)."""
+    digest = hashlib.sha256()
+    schema = [(str(column), str(dtype)) for column, dtype in df.dtypes.items()]
+    digest.update(json.dumps({'schema': schema, 'rows': len(df)}).encode())
+    if len(df):
+        rows = np.unique(np.linspace(0, len(df) - 1, min(sample_rows, len(df))).astype(np.int64))
+        digest.update(pd.util.hash_pandas_object(df.iloc[rows], index=True).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def file_fingerprint(path):
+    """Path, size and modification time: no need to read the file at all."""
+    stat = os.stat(path)
+    key = json.dumps([os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+class ReportCache:
+    """Section results on disk, one pickle per section and key."""
+
+    def __init__(self, root=CACHE_DIR, refresh=False):
+        self.root = root
+        self.refresh = refresh
+        self.hits = []
+        self.misses = []
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def key(section, fingerprint, params=None):
+        blob = json.dumps([CACHE_VERSION, section, fingerprint, params], sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+    def _path(self, section, key):
+        return os.path.join(self.root, f'{section}-{key}.pkl')
+
+    def get_or_compute(self, section, fingerprint, params, compute):
+        """The cached result of compute() for these inputs, computing it if needed."""
+        key = self.key(section, fingerprint, params)
+        path = self._path(section, key)
+        if not self.refresh and os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    value = pickle.load(f)
+                self.hits.append(section)
+                return value
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass  # unreadable entry: recompute and overwrite it
+
+        value = compute()
+        self._store(section, key, value)
+        self.misses.append(section)
+        return value
+
+    def _store(self, section, key, value):
+        # Write to a temporary file first, so a crash never leaves half an entry
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(section, key))
+        # Keep only the newest entry of each section
+        for name in os.listdir(self.root):
+            if name.startswith(f'{section}-') and name != f'{section}-{key}.pkl':
+                os.remove(os.path.join(self.root, name))
+
+    def summary(self):
+        return f"{len(self.hits)} section(s) from cache, {len(self.misses)} recomputed" + (
+            f" ({', '.join(self.misses)})" if self.misses else "")
@@ -0,0 +1,114 @@
+"""
+Titanic_EDA_Report.py
+Headless, parallel rendering of the figures in Titanic_EDA.py.
+
+plt.show() opens one window at a time and waits for it to be closed, and
+all drawing happens one figure after another in a single process. For a
+report that should just produce image files, that is wasted time.
+
+Here every figure is rendered by its own worker process:
+  - the Agg backend draws straight into memory, no display needed
+  - the worker gets only the small, pre-aggregated data its figure needs
+    (FIGURE_DATA in Titanic_EDA.py), not the whole dataset
+  - each figure is saved as PNG and/or SVG
+Since the figures are drawn at the same time, the whole report takes
+about as long as the slowest figure instead of the sum of all of them.
+
+A manifest (report.json) in the output directory records the cache key each
+figure was drawn from (see Titanic_EDA_Cache.py). Figures whose key is
+unchanged and whose files are still there are not drawn again.
+
+Run: python Titanic_EDA.py --report eda_report
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+FORMATS = ('png', 'svg')
+DPI = 100
+MANIFEST = 'report.json'
+
+
+def _init_worker():
+    # Works whether or not pyplot is already loaded here: a spawned worker
+    # has not imported it yet, so Agg is simply selected; a forked worker
+    # inherits the parent's pyplot (possibly with a GUI backend), and then
+    # matplotlib.use() switches it through pyplot.switch_backend(). Going
+    # to a non-interactive backend is always allowed.
+    import matplotlib
+    matplotlib.use('Agg')
+    import seaborn as sns
+    sns.set_theme(style="whitegrid")
+
+
+def render_figure(name, data, out_dir, formats=FORMATS):
+    """Draw one figure and save it; returns (paths, seconds)."""
+    import matplotlib.pyplot as plt
+    from Titanic_EDA import FIGURES
+
+    start = time.perf_counter()
+    fig = FIGURES[name](data)
+    paths = []
+    for fmt in formats:
+        path = os.path.join(out_dir, f'{name}.{fmt}')
+        fig.savefig(path, dpi=DPI)
+        paths.append(path)
+    plt.close(fig)
+    return paths, time.perf_counter() - start
+
+
+def _read_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def render_report(figure_data, out_dir, formats=FORMATS, workers=None, keys=None, force=False):
+    """Render the figures in parallel; returns timings per figure and overall.
+
+    keys: {figure name: cache key of its data}. A figure already rendered
+    from the same key, in the same formats, is kept as it is unless force.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = _read_manifest(out_dir)
+    keys = keys or {}
+    figures = {}
+    for name in figure_data:
+        entry = manifest.get(name, {})
+        if (not force and name in keys and entry.get('key') == keys[name] and entry.get('formats') == list(formats)
+                and all(os.path.exists(path) for path in entry.get('paths', []))):
+            figures[name] = {'paths': entry['paths'], 'seconds': 0.0, 'reused': True}
+
+    start = time.perf_counter()
+    pending = [name for name in figure_data if name not in figures]
+    if pending:
+        workers = workers or len(pending)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = {name: pool.submit(render_figure, name, figure_data[name], out_dir, formats)
+                       for name in pending}
+            for name, future in futures.items():
+                paths, seconds = future.result()
+                figures[name] = {'paths': paths, 'seconds': seconds, 'reused': False}
+
+    manifest = {name: {'key': keys.get(name), 'formats': list(formats), 'paths': figure['paths']}
+                for name, figure in figures.items()}
+    with open(os.path.join(out_dir, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return {
+        'figures': {name: figures[name] for name in figure_data},
+        'wall_seconds': time.perf_counter() - start,
+    }
+
+
+def print_render_summary(result):
+    for name, figure in result['figures'].items():
+        timing = 'unchanged' if figure['reused'] else f"{figure['seconds']:.2f}s"
+        print(f"  {name:<12} {timing:>9} -> {', '.join(figure['paths'])}")
+    total = sum(figure['seconds'] for figure in result['figures'].values())
+    slowest = max(figure['seconds'] for figure in result['figures'].values())
+    print(f"Report done in {result['wall_seconds']:.2f}s "
+          f"(slowest figure {slowest:.2f}s, all figures one after another {total:.2f}s)")
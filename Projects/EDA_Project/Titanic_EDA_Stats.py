@@ -0,0 +1,328 @@
+"""
+Titanic_EDA_Stats.py
+Out-of-core versions of the summary tables in Titanic_EDA.py:
+df.info(), df.isnull().sum(), df.describe() and numeric_df.corr().
+
+Instead of loading the whole file, the data is read in chunks and each
+chunk updates small "accumulators":
+  - counts and null counts per column
+  - min / max per numeric column
+  - mean, variance and covariance via co-moments (Welford / Chan et al.),
+    kept for every PAIR of numeric columns over the rows where both are
+    present -- the same pairwise rule pandas uses for corr()
+  - approximate quartiles from a t-digest (see Libraries/pandas/Pandas_OutOfCore.py)
+  - value counts for text columns (up to a limit)
+Memory depends on the number of columns, not on the number of rows.
+
+Which columns are numeric is decided once, from the first rows of the file
+(a column that is entirely missing there counts as text), and then kept
+for every chunk: a later value that is not a number is counted as missing.
+
+Accumulators are mergeable: two of them, built from different chunks with
+the same columns, combine into the one you would get from all rows. So
+chunks can also be summarized in parallel worker processes and merged at
+the end.
+
+Run: python Titanic_EDA_Stats.py [passengers.csv|.parquet] [chunk_size] [workers]
+"""
+
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# The chunk reader and t-digest are shared with ML_Project (streaming, drift)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Libraries', 'pandas'))
+from Pandas_OutOfCore import read_chunks, TDigest  # noqa: E402
+
+MAX_DISTINCT_VALUES = 1000  # text columns with more values stop counting them
+SCHEMA_SAMPLE_ROWS = 10_000  # rows read to decide which columns are numeric
+QUARTILES = [0.25, 0.5, 0.75]
+
+
+def _is_numeric(series):
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def infer_schema(chunk):
+    """(all columns, numeric columns) of a chunk.
+
+    An all-missing column is read as float by pandas, but says nothing
+    about its type, so it is not taken as numeric.
+    """
+    columns = list(chunk.columns)
+    numeric = [c for c in columns if _is_numeric(chunk[c]) and chunk[c].notna().any()]
+    return columns, numeric
+
+
+def sniff_schema(path, rows=SCHEMA_SAMPLE_ROWS):
+    """The schema of the first `rows` rows, independent of the chunk size."""
+    return infer_schema(next(read_chunks(path, rows)))
+
+
+class CoMoments:
+    """Pairwise-complete count, means, squared deviations and co-moments.
+
+    Entry [i, j] of every matrix describes the rows where columns i and j
+    are both present; the diagonal is the ordinary per-column statistics.
+    """
+
+    def __init__(self, n_columns):
+        shape = (n_columns, n_columns)
+        self.n = np.zeros(shape)
+        self.mean = np.zeros(shape)   # mean of column i over the (i, j) rows
+        self.m2 = np.zeros(shape)     # sum of squared deviations of column i there
+        self.c = np.zeros(shape)      # sum of (x_i - mean_i)(x_j - mean_j) there
+
+    @classmethod
+    def from_values(cls, values):
+        """Statistics of one chunk (rows x columns, NaN = missing)."""
+        moments = cls(values.shape[1])
+        present = ~np.isnan(values)
+        mask = present.astype(float)
+        # Centre on the chunk's column means first, so the sums stay small
+        shift = np.nanmean(np.where(present.any(axis=0), values, 0.0), axis=0)
+        shift = np.nan_to_num(shift)
+        x = np.where(present, values - shift, 0.0)
+
+        n = mask.T @ mask
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(n > 0, (x.T @ mask) / n, 0.0)  # [i, j]: mean of x_i on (i, j) rows
+            moments.m2 = np.maximum((x * x).T @ mask - n * mean ** 2, 0.0)
+            moments.c = x.T @ x - n * mean * mean.T
+        moments.n = n
+        moments.mean = mean + shift[:, None]
+        return moments
+
+    def merge(self, other):
+        """Chan et al.'s parallel update, for every (i, j) entry at once."""
+        n = self.n + other.n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(n > 0, self.n * other.n / n, 0.0)
+            delta = other.mean - self.mean
+            self.m2 = self.m2 + other.m2 + weight * delta ** 2
+            self.c = self.c + other.c + weight * delta * delta.T
+            self.mean = np.where(n > 0, self.mean + delta * np.where(n > 0, other.n / n, 0.0), 0.0)
+        self.n = n
+        return self
+
+    def correlation(self):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self.c / np.sqrt(self.m2 * self.m2.T)
+        return np.where(self.n > 1, corr, np.nan)
+
+
+class EDAStats:
+    """Mergeable summary of a table, built chunk by chunk.
+
+    schema: (columns, numeric columns), as from infer_schema(); by default
+    it is inferred from the first chunk.
+    """
+
+    def __init__(self, schema=None):
+        self.schema = schema
+        self.columns = None          # all columns, in file order
+        self.numeric = None          # numeric (non-bool) columns
+        self.dtypes = {}
+        self.rows = 0
+        self.non_null = Counter()
+        self.min = None
+        self.max = None
+        self.moments = None
+        self.digests = None
+        self.value_counts = {}
+
+    def _start(self, chunk):
+        if self.schema is None:
+            self.schema = infer_schema(chunk)
+        self.columns, self.numeric = (list(names) for names in self.schema)
+        self.min = np.full(len(self.numeric), np.inf)
+        self.max = np.full(len(self.numeric), -np.inf)
+        self.moments = CoMoments(len(self.numeric))
+        self.digests = {c: TDigest() for c in self.numeric}
+        self.value_counts = {c: Counter() for c in self.columns if c not in self.numeric}
+
+    def update(self, chunk):
+        if self.columns is None:
+            self._start(chunk)
+        for column in self.columns:
+            dtype = chunk[column].dtype
+            # A column that is all-missing in one chunk may be float there: keep the wider type
+            previous = self.dtypes.get(column)
+            self.dtypes[column] = dtype if previous is None else _combine_dtypes(previous, dtype)
+        self.rows += len(chunk)
+        self.non_null.update(chunk.notna().sum().to_dict())
+
+        # Text in a numeric column (e.g. a typo) counts as missing
+        values = chunk[self.numeric].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        with np.errstate(invalid='ignore'):
+            self.min = np.fmin(self.min, np.nanmin(np.where(np.isnan(values), np.inf, values), axis=0))
+            self.max = np.fmax(self.max, np.nanmax(np.where(np.isnan(values), -np.inf, values), axis=0))
+        self.moments.merge(CoMoments.from_values(values))
+        for i, column in enumerate(self.numeric):
+            self.digests[column].update(values[:, i])
+        for column, counts in self.value_counts.items():
+            if counts is not None:
+                counts.update(chunk[column].dropna().astype(str).tolist())
+                if len(counts) > MAX_DISTINCT_VALUES:
+                    self.value_counts[column] = None  # too many to be useful
+        return self
+
+    def merge(self, other):
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self.__dict__.update(other.__dict__)
+            return self
+        assert (self.columns, self.numeric) == (other.columns, other.numeric), \
+            "cannot merge summaries with different columns"
+        for column, dtype in other.dtypes.items():
+            self.dtypes[column] = _combine_dtypes(self.dtypes[column], dtype)
+        self.rows += other.rows
+        self.non_null.update(other.non_null)
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self.moments.merge(other.moments)
+        for column in self.numeric:
+            self.digests[column].merge(other.digests[column])
+        for column, counts in self.value_counts.items():
+            theirs = other.value_counts[column]
+            if counts is None or theirs is None:
+                self.value_counts[column] = None
+            else:
+                counts.update(theirs)
+                if len(counts) > MAX_DISTINCT_VALUES:
+                    self.value_counts[column] = None
+        return self
+
+    # ------------------------------------------------------------
+    # The tables, shaped like their pandas counterparts
+    # ------------------------------------------------------------
+
+    def info(self):
+        """Like df.info(): non-null count and dtype per column."""
+        return pd.DataFrame({
+            'Column': self.columns,
+            'Non-Null Count': [self.non_null[c] for c in self.columns],
+            'Dtype': [str(self.dtypes[c]) for c in self.columns],
+        })
+
+    def isnull(self):
+        """Like df.isnull().sum()."""
+        return pd.Series({c: self.rows - self.non_null[c] for c in self.columns}, dtype='int64')
+
+    def describe(self):
+        """Like df.describe() (quartiles are approximate)."""
+        diagonal = np.arange(len(self.numeric))
+        n = self.moments.n[diagonal, diagonal]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.sqrt(self.moments.m2[diagonal, diagonal] / (n - 1))
+        table = {
+            'count': n,
+            'mean': np.where(n > 0, self.moments.mean[diagonal, diagonal], np.nan),
+            'std': np.where(n > 1, std, np.nan),
+            'min': np.where(n > 0, self.min, np.nan),
+        }
+        quartiles = np.array([self.digests[c].quantile(QUARTILES) if n[i] else [np.nan] * 3
+                              for i, c in enumerate(self.numeric)])
+        for k, label in enumerate(['25%', '50%', '75%']):
+            table[label] = quartiles[:, k]
+        table['max'] = np.where(n > 0, self.max, np.nan)
+        return pd.DataFrame(table, index=self.numeric).T
+
+    def corr(self):
+        """Like numeric_df.corr() (Pearson, pairwise-complete rows)."""
+        return pd.DataFrame(self.moments.correlation(), index=self.numeric, columns=self.numeric)
+
+
+def _combine_dtypes(a, b):
+    if a == b:
+        return a
+    try:
+        return np.result_type(a, b)
+    except TypeError:  # e.g. category vs object
+        return np.dtype(object)
+
+
+# ------------------------------------------------------------
+# Summarizing a file, optionally in parallel
+# ------------------------------------------------------------
+
+def _summarize_chunk(chunk, schema):
+    return EDAStats(schema).update(chunk)
+
+
+def summarize_file(path, chunk_size=100_000, workers=1, schema=None):
+    """One pass over the file; with workers > 1, chunks are summarized in parallel.
+
+    The schema (see infer_schema()) defaults to that of the first rows of
+    the file. Every chunk, in every worker, is summarized with it, so the
+    results can be merged.
+    """
+    schema = schema or sniff_schema(path)
+    total = EDAStats(schema)
+    if workers <= 1:
+        for chunk in read_chunks(path, chunk_size):
+            total.update(chunk)
+        return total
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in read_chunks(path, chunk_size):
+            pending.append(pool.submit(_summarize_chunk, chunk, schema))
+            if len(pending) >= 2 * workers:  # bounded number of chunks in memory
+                total.merge(pending.popleft().result())
+        while pending:
+            total.merge(pending.popleft().result())
+    return total
+
+
+def main(path=None, chunk_size=100_000, workers=1):
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Libraries', 'seaborn'))
+    from Seaborn_Datasets import load_dataset
+
+    print("=== OUT-OF-CORE EDA STATISTICS ===")
+    df = load_dataset('titanic')
+    if path is None:
+        # A demo file: the Titanic rows repeated, written chunk by chunk
+        path = os.path.join('.cache', 'titanic_eda.csv')
+        os.makedirs('.cache', exist_ok=True)
+        for i in range(100):
+            df.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        print(f"Wrote a demo file with {len(df) * 100:,} rows to '{path}'")
+
+    start = time.perf_counter()
+    stats = summarize_file(path, chunk_size, workers)
+    print(f"Summarized {stats.rows:,} rows in {time.perf_counter() - start:.2f}s "
+          f"({workers} worker(s), chunks of {chunk_size:,})")
+
+    print("\n--- Dataset Info ---")
+    print(stats.info().to_string())
+    print("\n--- Missing Values ---")
+    print(stats.isnull())
+    print("\n--- Statistical Summary ---")
+    print(stats.describe())
+    print("\n--- Correlation Matrix ---")
+    print(stats.corr().round(2))
+
+    # The same tables from pandas, when the file does fit in memory
+    if path.endswith('.csv') and os.path.getsize(path) < 200 * 2 ** 20:
+        full = pd.read_csv(path)
+        numeric = full.select_dtypes(include=[np.number])
+        exact = ['count', 'mean', 'std', 'min', 'max']
+        print("\nChecks against pandas on the fully loaded file:")
+        print(f"  isnull().sum() equal: {stats.isnull().equals(full.isnull().sum())}")
+        print(f"  describe() count/mean/std/min/max equal: "
+              f"{np.allclose(stats.describe().loc[exact], numeric.describe().loc[exact], equal_nan=True)}")
+        print(f"  corr() equal: {np.allclose(stats.corr(), numeric.corr(), equal_nan=True)}")
+        quartile_error = (stats.describe().loc[['25%', '50%', '75%']] - numeric.describe().loc[['25%', '50%', '75%']]).abs()
+        print(f"  largest quartile difference (approximate by design): {quartile_error.max().max():.3f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 100_000,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 1)
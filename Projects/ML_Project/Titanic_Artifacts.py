@@ -0,0 +1,254 @@
+# ============================================================
+# MODEL ARTIFACTS: MANIFEST, MEMORY-MAPPED LOADING, BENCHMARK
+# ============================================================
+# joblib.dump(model, 'model.joblib') + joblib.load() is the simplest way
+# to save a model, but every worker process then reads and decompresses
+# the whole file and keeps its own private copy in RAM.
+#
+# The artifact format used here is a folder:
+#   model.joblib     the pipeline, dumped *uncompressed*
+#   manifest.json    library versions, the feature schema, file checksum
+#
+# Uncompressed NumPy arrays can be loaded with joblib.load(mmap_mode='r'):
+# instead of being read into private memory, they are mapped straight
+# from the file, so the OS page cache shares them between workers.
+#
+# Caveat worth knowing: scikit-learn's tree objects copy their node arrays
+# into their own buffers when unpickled, so a RandomForest's trees are NOT
+# shared this way -- only plain array attributes are (scaler means, linear
+# coefficients, ...). The benchmark below shows the real effect; for
+# forests, Titanic_Compile.py stores the trees as flat .npy arrays that
+# are memory-mapped and read directly at prediction time.
+#
+# Run: python Titanic_Artifacts.py [model.joblib] [n_workers]
+# (after Titanic_ML.py has saved 'titanic_rf_model.joblib')
+# ============================================================
+
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+import warnings
+
+import joblib
+import numpy as np
+import sklearn
+
+MODEL_FILE = 'model.joblib'
+MANIFEST_FILE = 'manifest.json'
+
+
+# ============================================================
+# 1. SAVING AND LOADING
+# ============================================================
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def feature_schema(X):
+    """Column names and dtypes of the training frame, in order."""
+    return [{'name': column, 'dtype': str(dtype)} for column, dtype in X.dtypes.items()]
+
+
+def save_artifact(model, directory, X):
+    """Save `model` uncompressed with a manifest describing it (and X, its training frame)."""
+    os.makedirs(directory, exist_ok=True)
+    model_path = os.path.join(directory, MODEL_FILE)
+    joblib.dump(model, model_path, compress=0)  # compress=0 is what makes mmap possible
+
+    manifest = {
+        'format_version': 1,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'model_class': type(model).__name__,
+        'python_version': platform.python_version(),
+        'sklearn_version': sklearn.__version__,
+        'numpy_version': np.__version__,
+        'joblib_version': joblib.__version__,
+        'features': feature_schema(X),
+        'model_file': MODEL_FILE,
+        'model_bytes': os.path.getsize(model_path),
+        'model_sha256': file_sha256(model_path),
+    }
+    with open(os.path.join(directory, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def _schema_text(features):
+    return ', '.join(f"{f['name']} ({f['dtype']})" for f in features)
+
+
+def load_artifact(directory, mmap_mode='r', verify_checksum=False, X=None):
+    """Load a saved artifact, warning if the library versions differ.
+
+    Raises ValueError if the model does not take the columns the manifest
+    lists, or, when a frame X is given, if its columns and dtypes differ
+    from the manifest's: better now than at the first prediction.
+    """
+    manifest = read_manifest(directory)
+    if manifest['sklearn_version'] != sklearn.__version__:
+        warnings.warn(f"Artifact was saved with scikit-learn {manifest['sklearn_version']}, "
+                      f"but {sklearn.__version__} is installed")
+    model_path = os.path.join(directory, manifest['model_file'])
+    if verify_checksum and file_sha256(model_path) != manifest['model_sha256']:
+        raise ValueError(f"Checksum mismatch for {model_path}")
+    model = joblib.load(model_path, mmap_mode=mmap_mode)
+
+    expected = [f['name'] for f in manifest['features']]
+    fitted = getattr(model, 'feature_names_in_', None)  # set when fitted on a DataFrame
+    if fitted is not None and list(fitted) != expected:
+        raise ValueError(f"{model_path} was fitted on columns {list(fitted)}, "
+                         f"but the manifest lists {expected}")
+    if X is not None and feature_schema(X) != manifest['features']:
+        raise ValueError(f"Input columns {_schema_text(feature_schema(X))} do not match "
+                         f"the artifact's schema {_schema_text(manifest['features'])}")
+    return model
+
+
+def load_model(path, mmap_mode='r'):
+    """Load either an artifact folder or a plain .joblib file."""
+    if os.path.isdir(path):
+        return load_artifact(path, mmap_mode=mmap_mode)
+    return joblib.load(path)
+
+
+class LazyModel:
+    """Defers loading until the first prediction, e.g. in forked workers."""
+
+    def __init__(self, path, mmap_mode='r'):
+        self.path = path
+        self.mmap_mode = mmap_mode
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = load_model(self.path, mmap_mode=self.mmap_mode)
+        return self._model
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(X)
+
+
+# ============================================================
+# 2. MEASURING MEMORY OF A PROCESS
+# ============================================================
+
+def memory_usage_mb():
+    """(RSS, PSS) of this process in MB. PSS splits shared pages fairly
+    between the processes sharing them, so it shows the real cost; it is
+    only available on Linux (None elsewhere)."""
+    rss = pss = None
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Rss:'):
+                    rss = int(line.split()[1]) / 1024
+                elif line.startswith('Pss:'):
+                    pss = int(line.split()[1]) / 1024
+    except OSError:
+        try:
+            import psutil
+            rss = psutil.Process().memory_info().rss / 2 ** 20
+        except ImportError:
+            pass
+    return rss, pss
+
+
+# ============================================================
+# 3. BENCHMARK: LOAD TIME AND MEMORY FOR N WORKERS
+# ============================================================
+
+def _benchmark_worker(path, mmap_mode, barrier, results):
+    # sklearn is imported before timing, so only the model load is measured
+    import sklearn.ensemble  # noqa: F401
+    base_rss, base_pss = memory_usage_mb()
+    start = time.perf_counter()
+    model = joblib.load(path, mmap_mode=mmap_mode)
+    load_seconds = time.perf_counter() - start
+    # Wait until every worker has loaded, so shared pages are counted as shared
+    barrier.wait()
+    rss, pss = memory_usage_mb()
+    results.put({
+        'load_seconds': load_seconds,
+        'rss_mb': rss - base_rss,
+        'pss_mb': None if pss is None else pss - base_pss,
+    })
+    barrier.wait()
+    del model
+
+
+def benchmark_loading(path, mmap_mode=None, n_workers=4):
+    """Start `n_workers` fresh processes that all load `path` at once."""
+    ctx = multiprocessing.get_context('spawn')  # cold processes, like real workers
+    barrier = ctx.Barrier(n_workers)
+    results = ctx.Queue()
+    workers = [ctx.Process(target=_benchmark_worker, args=(path, mmap_mode, barrier, results))
+               for _ in range(n_workers)]
+    for worker in workers:
+        worker.start()
+    rows = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    pss = [r['pss_mb'] for r in rows if r['pss_mb'] is not None]
+    return {
+        'file_mb': os.path.getsize(path) / 2 ** 20,
+        'mean_load_seconds': float(np.mean([r['load_seconds'] for r in rows])),
+        'mean_rss_mb': float(np.mean([r['rss_mb'] for r in rows])),
+        'total_pss_mb': float(np.sum(pss)) if pss else None,
+    }
+
+
+def main(model_path='titanic_rf_model.joblib', n_workers=4):
+    from Titanic_ML import load_data
+    print("=" * 50)
+    print("MODEL ARTIFACT LOAD BENCHMARK")
+    print("=" * 50)
+
+    model = joblib.load(model_path)
+    bench_dir = '.cache/artifact_benchmark'
+    os.makedirs(bench_dir, exist_ok=True)
+    compressed_path = os.path.join(bench_dir, 'compressed.joblib')
+    joblib.dump(model, compressed_path, compress=3)
+
+    # The manifest records the schema of the frame the model was trained on
+    X, _ = load_data()
+    artifact_dir = os.path.join(bench_dir, 'artifact')
+    save_artifact(model, artifact_dir, X)
+    artifact_path = os.path.join(artifact_dir, MODEL_FILE)
+
+    variants = [
+        ('joblib compress=3', compressed_path, None),
+        ('uncompressed', artifact_path, None),
+        ("uncompressed + mmap_mode='r'", artifact_path, 'r'),
+    ]
+    print(f"{n_workers} worker processes each load the model at the same time\n")
+    print(f"{'format':<30}{'file MB':>9}{'load ms':>10}{'RSS MB':>9}{'total PSS MB':>14}")
+    for label, path, mmap_mode in variants:
+        r = benchmark_loading(path, mmap_mode=mmap_mode, n_workers=n_workers)
+        pss = f"{r['total_pss_mb']:.1f}" if r['total_pss_mb'] is not None else 'n/a'
+        print(f"{label:<30}{r['file_mb']:>9.2f}{r['mean_load_seconds'] * 1000:>10.1f}"
+              f"{r['mean_rss_mb']:>9.1f}{pss:>14}")
+
+
+if __name__ == "__main__":
+    model_path = sys.argv[1] if len(sys.argv) > 1 else 'titanic_rf_model.joblib'
+    n_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    main(model_path, n_workers)
@@ -0,0 +1,162 @@
+# ============================================================
+# PARALLEL BATCH SCORING OF LARGE FILES
+# ============================================================
+# loaded_model.predict(X) needs all of X in memory at once, and uses one
+# core. For a 50M-row file neither is acceptable.
+#
+# This command scores a file chunk by chunk:
+#   - the main process reads the input in chunks (CSV or Parquet)
+#   - a pool of worker processes scores them; each worker loads the
+#     model once, when it starts (memory-mapped for artifact folders)
+#   - results are written as soon as they are ready, in input order
+#   - if scoring fails, the partial output file is removed; an empty input
+#     still gives an output file, with the header/schema and no rows
+#
+# Only a fixed number of chunks is in flight at any time (2 per worker),
+# so memory use depends on the chunk size, not on the file size.
+#
+# Run: python Titanic_BatchScoring.py titanic_rf_model.joblib passengers.csv scores.csv
+#      [--chunk-size 50000] [--workers N]
+# (the output format follows the extension: .csv or .parquet)
+# ============================================================
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from Titanic_Artifacts import load_model
+from Titanic_Memory import peak_rss_mb  # standard library only, cheap to import
+from Titanic_Training import available_cores
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Libraries', 'pandas'))
+from Pandas_OutOfCore import read_chunks  # noqa: E402
+
+IN_FLIGHT_PER_WORKER = 2
+
+
+# ============================================================
+# 1. THE WORKER SIDE
+# ============================================================
+
+_model = None
+
+
+def _init_worker(model_path):
+    """Runs once per worker process: load the model and keep it."""
+    global _model
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(limits=1)  # the pool already uses every core
+    _model = load_model(model_path)
+
+
+def _result_frame(model, probabilities, first_row):
+    """row, prediction and one probability_<label> column per class."""
+    result = pd.DataFrame({
+        'row': np.arange(first_row, first_row + len(probabilities)),
+        'prediction': model.classes_[probabilities.argmax(axis=1)],
+    })
+    for i, label in enumerate(model.classes_):
+        result[f'probability_{label}'] = probabilities[:, i]
+    return result
+
+
+def _score_chunk(chunk, first_row):
+    return _result_frame(_model, _model.predict_proba(chunk), first_row)
+
+
+# ============================================================
+# 2. WRITING THE OUTPUT INCREMENTALLY
+# ============================================================
+
+class ResultWriter:
+    """Appends DataFrames to a CSV or Parquet file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith('.parquet')
+        self._writer = None
+        self._started = False
+
+    def write(self, frame):
+        if self.parquet:
+            import pyarrow as pa  # optional dependency, only needed for Parquet
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode='a' if self._started else 'w', header=not self._started, index=False)
+        self._started = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+# ============================================================
+# 3. THE SCORING LOOP
+# ============================================================
+
+def score_file(model_path, input_path, output_path, chunk_size=50_000, workers=None):
+    """Score `input_path` in parallel and write the results in input order."""
+    workers = workers or available_cores()
+    writer = ResultWriter(output_path)
+    pending = deque()
+    rows = 0
+    start = time.perf_counter()
+    completed = False
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(model_path,)) as pool:
+            for chunk in read_chunks(input_path, chunk_size):
+                if chunk.empty:
+                    continue  # a header-only CSV still yields one chunk
+                pending.append(pool.submit(_score_chunk, chunk, rows))
+                rows += len(chunk)
+                # Wait for the oldest chunk before reading further: keeps the
+                # output in order and the number of chunks in memory bounded
+                if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                    writer.write(pending.popleft().result())
+            while pending:
+                writer.write(pending.popleft().result())
+        if rows == 0:
+            # No chunk was scored: write the header/schema with no rows
+            model = load_model(model_path)
+            writer.write(_result_frame(model, np.empty((0, len(model.classes_))), 0))
+        completed = True
+    finally:
+        writer.close()
+        if not completed and os.path.exists(output_path):
+            os.remove(output_path)  # don't leave a truncated file that looks like a result
+    seconds = time.perf_counter() - start
+    return {'rows': rows, 'seconds': seconds, 'rows_per_second': rows / seconds, 'workers': workers}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a large CSV/Parquet file with a saved pipeline")
+    parser.add_argument('model', help="a .joblib file or an artifact folder")
+    parser.add_argument('input', help="CSV or Parquet file with the feature columns")
+    parser.add_argument('output', help="where to write the scores (.csv or .parquet)")
+    parser.add_argument('--chunk-size', type=int, default=50_000)
+    parser.add_argument('--workers', type=int, default=None, help="default: all available cores")
+    args = parser.parse_args()
+
+    if os.path.abspath(args.input) == os.path.abspath(args.output):
+        parser.error("input and output must be different files")
+    report = score_file(args.model, args.input, args.output, args.chunk_size, args.workers)
+    peak = peak_rss_mb()
+    print(f"Scored {report['rows']:,} rows with {report['workers']} worker(s) in {report['seconds']:.1f}s "
+          f"({report['rows_per_second']:,.0f} rows/s); peak memory of the reader: "
+          f"{'unknown' if peak is None else f'{peak:.0f} MB'}")
+    print(f"Scores written to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
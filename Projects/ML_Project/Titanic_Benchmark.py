@@ -0,0 +1,234 @@
+# ============================================================
+# SCALING BENCHMARK FOR THE TITANIC PIPELINES
+# ============================================================
+# 891 rows say nothing about how the pipelines behave on real volumes.
+# This benchmark synthetically "upsamples" the Titanic data to larger
+# sizes and measures, for both pipelines from Titanic_ML.py:
+#   - fit time
+#   - predict throughput (rows per second)
+#   - peak memory of the process
+#   - size of the saved model artifact
+#
+# Synthetic rows are real rows drawn with replacement, with small noise
+# added to age/fare, so the schema, value ranges and missing-value rate
+# match the original.
+#
+# Every (size, pipeline) measurement runs in a fresh process, so peak
+# memory is not polluted by earlier runs. Results are written as JSON;
+# pass --baseline old.json to flag metrics that got noticeably worse.
+#
+# Run: python Titanic_Benchmark.py --sizes 10000,1000000,10000000
+# (10M rows with a 100-tree forest takes a long time; start small)
+# ============================================================
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+
+from Titanic_ML import load_data, build_preprocessor, build_pipelines
+from Titanic_Memory import peak_rss_mb
+
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+PREDICT_ROWS = 100_000
+# How much worse a metric may get before it counts as a regression
+HIGHER_IS_WORSE = {'fit_seconds': 0.25, 'peak_rss_mb': 0.15, 'artifact_bytes': 0.10}
+LOWER_IS_WORSE = {'predict_rows_per_second': 0.25}
+
+
+# ============================================================
+# 1. SYNTHETIC UPSAMPLING
+# ============================================================
+
+def upsample(X, y, n_rows, seed=0, chunk_size=1_000_000):
+    """Draw `n_rows` rows with replacement and jitter the continuous columns."""
+    rng = np.random.default_rng(seed)
+    parts_X, parts_y = [], []
+    for start in range(0, n_rows, chunk_size):
+        size = min(chunk_size, n_rows - start)
+        idx = rng.integers(0, len(X), size)
+        part = X.iloc[idx].reset_index(drop=True)
+        # Multiplicative noise keeps values positive; NaNs stay NaN
+        part['age'] = (part['age'] * rng.normal(1.0, 0.05, size)).clip(0.1, 90).round(1)
+        part['fare'] = (part['fare'] * rng.normal(1.0, 0.05, size)).clip(0, None).round(2)
+        parts_X.append(part)
+        parts_y.append(y.to_numpy()[idx])
+    X_big = pd.concat(parts_X, ignore_index=True)
+    # Categorical dtype keeps 10M string values from costing gigabytes
+    for column in ['sex', 'embarked']:
+        X_big[column] = X_big[column].astype('category')
+    return X_big, pd.Series(np.concatenate(parts_y), name=y.name)
+
+
+# ============================================================
+# 2. ONE MEASUREMENT (RUNS IN ITS OWN PROCESS)
+# ============================================================
+
+def _measure(n_rows, model_name, results):
+    X, y = load_data()
+    X_big, y_big = upsample(X, y, n_rows)
+    data_mb = X_big.memory_usage(deep=True).sum() / 2 ** 20
+    pipeline = build_pipelines(build_preprocessor())[model_name]
+
+    start = time.perf_counter()
+    pipeline.fit(X_big, y_big)
+    fit_seconds = time.perf_counter() - start
+
+    X_predict = X_big.iloc[:PREDICT_ROWS]
+    start = time.perf_counter()
+    pipeline.predict(X_predict)
+    predict_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.joblib')
+        joblib.dump(pipeline, path)
+        artifact_bytes = os.path.getsize(path)
+
+    peak_mb = peak_rss_mb()
+    results.put({
+        'rows': n_rows,
+        'model': model_name,
+        'data_mb': round(data_mb, 1),
+        'fit_seconds': round(fit_seconds, 3),
+        'predict_rows_per_second': round(len(X_predict) / predict_seconds),
+        'peak_rss_mb': round(peak_mb, 1) if peak_mb is not None else None,
+        'artifact_bytes': artifact_bytes,
+    })
+
+
+def measure_in_subprocess(n_rows, model_name, timeout=None):
+    """Run one measurement in a fresh process.
+
+    If the process dies (e.g. killed for running out of memory) or takes
+    longer than `timeout` seconds, a row with an 'error' is returned.
+    """
+    ctx = multiprocessing.get_context('spawn')
+    results = ctx.Queue()
+    process = ctx.Process(target=_measure, args=(n_rows, model_name, results))
+    process.start()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    result, error = None, None
+    while result is None and error is None:
+        try:
+            result = results.get(timeout=1.0)
+        except queue.Empty:
+            if not process.is_alive():
+                try:  # its last message may still be on the way
+                    result = results.get(timeout=1.0)
+                except queue.Empty:
+                    error = _exit_reason(process)
+            elif deadline is not None and time.monotonic() > deadline:
+                process.terminate()
+                error = f"timed out after {timeout:.0f}s"
+    process.join()
+    if error is not None:
+        return {'rows': n_rows, 'model': model_name, 'error': error}
+    return result
+
+
+def _exit_reason(process):
+    process.join()
+    code = process.exitcode
+    if code is not None and code < 0:
+        return f"worker killed by signal {-code} (out of memory?)"
+    return f"worker exited with code {code} without a result"
+
+
+# ============================================================
+# 3. RESULTS AND REGRESSION CHECK
+# ============================================================
+
+def environment():
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'sklearn': sklearn.__version__,
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def find_regressions(results, baseline):
+    """Compare against a previous results file; return human-readable issues."""
+    old = {(r['rows'], r['model']): r for r in baseline['results']}
+    issues = []
+    for row in results:
+        previous = old.get((row['rows'], row['model']))
+        if previous is None:
+            continue
+        if 'error' in row and 'error' not in previous:
+            issues.append(f"{row['model']} @ {row['rows']:,} rows: failed ({row['error']})")
+            continue
+        for metric in {**HIGHER_IS_WORSE, **LOWER_IS_WORSE}:
+            before, after = previous.get(metric), row.get(metric)
+            if not before or not after:
+                continue
+            if metric in HIGHER_IS_WORSE:
+                worse = after > before * (1 + HIGHER_IS_WORSE[metric])
+            else:
+                worse = after < before * (1 - LOWER_IS_WORSE[metric])
+            if worse:
+                issues.append(f"{row['model']} @ {row['rows']:,} rows: {metric} {before} -> {after}")
+    return issues
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmark for the Titanic pipelines")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated row counts")
+    parser.add_argument('--models', default='Random Forest,Logistic Regression')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help="previous results file to compare against")
+    parser.add_argument('--timeout', type=float, default=3600,
+                        help="seconds one measurement may take before it is stopped")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',')]
+    models = args.models.split(',')
+    print("=" * 50)
+    print("TITANIC PIPELINE SCALING BENCHMARK")
+    print("=" * 50)
+    print(f"{'rows':>12} {'model':<20} {'fit s':>9} {'predict rows/s':>15} {'peak MB':>9} {'artifact KB':>12}")
+
+    results = []
+    for n_rows in sizes:
+        for model_name in models:
+            row = measure_in_subprocess(n_rows, model_name, timeout=args.timeout)
+            results.append(row)
+            if 'error' in row:
+                print(f"{row['rows']:>12,} {row['model']:<20} FAILED: {row['error']}")
+                continue
+            print(f"{row['rows']:>12,} {row['model']:<20} {row['fit_seconds']:>9.2f} "
+                  f"{row['predict_rows_per_second']:>15,} {row['peak_rss_mb']:>9} "
+                  f"{row['artifact_bytes'] / 1024:>12,.0f}")
+
+    with open(args.output, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    print(f"\nResults written to '{args.output}'")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            issues = find_regressions(results, json.load(f))
+        print(f"Compared with '{args.baseline}': "
+              f"{'no regressions' if not issues else str(len(issues)) + ' regression(s)'}")
+        for issue in issues:
+            print(f"  REGRESSION {issue}")
+        if issues:
+            raise SystemExit(1)  # non-zero exit, so a CI job fails
+    if any('error' in row for row in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
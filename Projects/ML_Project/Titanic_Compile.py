@@ -0,0 +1,267 @@
+# ============================================================
+# COMPILING THE FITTED PIPELINE INTO PURE NUMPY
+# ============================================================
+# loaded_model.predict(one_passenger) goes through
+#   DataFrame -> ColumnTransformer -> SimpleImputer -> StandardScaler
+#   -> OneHotEncoder -> RandomForest
+# and most of the time is spent on pandas and input validation, not on
+# the model itself.
+#
+# "Compiling" reads the learned numbers out of the fitted pipeline and
+# stores them as a handful of flat arrays:
+#   - numeric:      impute value, scaler mean, scaler scale per column
+#   - categorical:  impute value and a {category: output column} map
+#   - forest:       all trees' nodes packed into contiguous arrays
+#   - or, for LogisticRegression, the coefficients and intercept
+# Prediction then needs nothing but NumPy, and takes plain dicts.
+#
+# The packed arrays can be saved as .npy files and memory-mapped, so
+# several worker processes share one copy of the forest in RAM.
+#
+# Run: python Titanic_Compile.py [titanic_rf_model.joblib]
+# ============================================================
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ARRAY_NAMES = ['num_fill', 'num_mean', 'num_scale',
+               'children', 'feature', 'threshold', 'leaf_proba', 'roots', 'coef', 'intercept']
+
+
+# ============================================================
+# 1. EXTRACTING THE ARRAYS FROM A FITTED PIPELINE
+# ============================================================
+
+def _compile_forest(forest):
+    """Pack every tree of a fitted forest into shared node arrays.
+
+    children[2 * node] is the left child and children[2 * node + 1] the
+    right one. Leaves point to themselves, so walking `max_depth` steps
+    from the roots always ends on a leaf without "is this a leaf?" checks.
+    """
+    children, features, thresholds, probas, roots = [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        n = tree.node_count
+        node_ids = np.arange(n) + offset
+        is_leaf = tree.children_left == -1
+        left = np.where(is_leaf, node_ids, tree.children_left + offset)
+        right = np.where(is_leaf, node_ids, tree.children_right + offset)
+        children.append(np.column_stack([left, right]).ravel())
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(tree.threshold)
+        value = tree.value[:, 0, :]
+        probas.append(value / value.sum(axis=1, keepdims=True))
+        roots.append(offset)
+        offset += n
+        max_depth = max(max_depth, tree.max_depth)
+    return {
+        'children': np.concatenate(children).astype(np.intp),
+        'feature': np.concatenate(features).astype(np.intp),
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'leaf_proba': np.concatenate(probas).astype(np.float64),
+        'roots': np.array(roots, dtype=np.intp),
+    }, max_depth
+
+
+def compile_pipeline(pipeline):
+    """Turn a fitted Titanic pipeline into a CompiledModel."""
+    # Imported here, so loading and using a CompiledModel needs only NumPy
+    from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier
+    from sklearn.linear_model import LogisticRegression
+
+    preprocessor = pipeline.named_steps['preprocessor']
+    classifier = pipeline.named_steps['classifier']
+    transformers = {name: (trans, cols) for name, trans, cols in preprocessor.transformers_}
+
+    num_pipe, numeric_columns = transformers['num']
+    cat_pipe, categorical_columns = transformers['cat']
+    scaler = num_pipe.named_steps['scaler']
+    encoder = cat_pipe.named_steps['onehot']
+    arrays = {
+        'num_fill': num_pipe.named_steps['imputer'].statistics_.astype(np.float64),
+        'num_mean': scaler.mean_.astype(np.float64),
+        'num_scale': scaler.scale_.astype(np.float64),
+    }
+
+    # One-hot columns come right after the numeric ones, in category order
+    category_maps = []
+    position = len(numeric_columns)
+    for categories in encoder.categories_:
+        category_maps.append({_to_builtin(c): position + i for i, c in enumerate(categories)})
+        position += len(categories)
+    meta = {
+        'numeric_columns': list(numeric_columns),
+        'categorical_columns': list(categorical_columns),
+        'categorical_fill': [_to_builtin(v) for v in cat_pipe.named_steps['imputer'].statistics_],
+        'category_maps': category_maps,
+        'n_features': position,
+        'classes': [_to_builtin(c) for c in classifier.classes_],
+    }
+
+    if isinstance(classifier, (RandomForestClassifier, ExtraTreesClassifier)):
+        forest_arrays, max_depth = _compile_forest(classifier)
+        arrays.update(forest_arrays)
+        meta.update(kind='forest', max_depth=int(max_depth))
+    elif isinstance(classifier, LogisticRegression) and len(classifier.classes_) == 2:
+        arrays['coef'] = classifier.coef_[0].astype(np.float64)
+        arrays['intercept'] = classifier.intercept_.astype(np.float64)
+        meta.update(kind='logistic')
+    else:
+        raise TypeError(f"Cannot compile a {type(classifier).__name__}")
+    return CompiledModel(arrays, meta)
+
+
+def _to_builtin(value):
+    """NumPy scalars -> plain Python values, so they hash like user input and fit in JSON."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and value != value)
+
+
+# ============================================================
+# 2. THE COMPILED MODEL
+# ============================================================
+
+class CompiledModel:
+    """NumPy-only predictor built from a fitted pipeline."""
+
+    def __init__(self, arrays, meta):
+        self.arrays = arrays
+        self.meta = meta
+        self.classes_ = np.array(meta['classes'])
+        self._numeric = meta['numeric_columns']
+        self._categorical = list(zip(meta['categorical_columns'], meta['categorical_fill'],
+                                     meta['category_maps']))
+
+    def transform(self, rows):
+        """Rows (a dict or a list of dicts) -> the preprocessed design matrix."""
+        if isinstance(rows, dict):
+            rows = [rows]
+        a = self.arrays
+        X = np.zeros((len(rows), self.meta['n_features']))
+
+        numeric = np.array([[row.get(c) for c in self._numeric] for row in rows], dtype=np.float64)
+        numeric = np.where(np.isnan(numeric), a['num_fill'], numeric)
+        X[:, :len(self._numeric)] = (numeric - a['num_mean']) / a['num_scale']
+
+        for i, row in enumerate(rows):
+            for column, fill, mapping in self._categorical:
+                value = row.get(column)
+                if _is_missing(value):
+                    value = fill
+                position = mapping.get(value)
+                if position is not None:  # unknown categories stay all-zero
+                    X[i, position] = 1.0
+        return X
+
+    def predict_proba(self, rows):
+        X = self.transform(rows)
+        a = self.arrays
+        if self.meta['kind'] == 'logistic':
+            p = 1.0 / (1.0 + np.exp(-(X @ a['coef'] + a['intercept'][0])))
+            return np.column_stack([1 - p, p])
+
+        # Trees compare float32 features against float64 thresholds, like sklearn
+        X = X.astype(np.float32)
+        X_flat = X.ravel()
+        row_start = (np.arange(len(X)) * X.shape[1])[:, None]
+        children, feature, threshold = a['children'], a['feature'], a['threshold']
+
+        # One node per (row, tree); every step moves all of them down one level
+        nodes = np.tile(a['roots'], (len(X), 1))
+        for _ in range(self.meta['max_depth']):
+            go_right = X_flat[row_start + feature[nodes]] > threshold[nodes]
+            next_nodes = children[2 * nodes + go_right]
+            if np.array_equal(next_nodes, nodes):  # everyone has reached a leaf
+                break
+            nodes = next_nodes
+        return a['leaf_proba'][nodes].mean(axis=1)
+
+    def predict(self, rows):
+        return self.classes_[self.predict_proba(rows).argmax(axis=1)]
+
+    # ------------------------------------------------------------
+    # Saving as .npy files, which can be memory-mapped when loaded
+    # ------------------------------------------------------------
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name, array in self.arrays.items():
+            np.save(os.path.join(directory, f'{name}.npy'), np.ascontiguousarray(array))
+        meta = dict(self.meta)
+        # JSON keys must be strings, so store the category maps as pairs
+        meta['category_maps'] = [list(m.items()) for m in self.meta['category_maps']]
+        with open(os.path.join(directory, 'compiled.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        with open(os.path.join(directory, 'compiled.json')) as f:
+            meta = json.load(f)
+        meta['category_maps'] = [dict(pairs) for pairs in meta['category_maps']]
+        # np.asarray keeps the memory map but drops the slower np.memmap subclass
+        arrays = {name: np.asarray(np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode))
+                  for name in ARRAY_NAMES
+                  if os.path.exists(os.path.join(directory, f'{name}.npy'))}
+        return cls(arrays, meta)
+
+
+# ============================================================
+# 3. PARITY CHECK AND TIMING
+# ============================================================
+
+def _time_per_call(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main(model_path='titanic_rf_model.joblib'):
+    import joblib
+    import pandas as pd
+    from Titanic_ML import load_data
+
+    print("=" * 50)
+    print("COMPILING THE FITTED PIPELINE")
+    print("=" * 50)
+    loaded_model = joblib.load(model_path)
+    compiled = compile_pipeline(loaded_model)
+    compiled.save('titanic_rf_compiled')
+    compiled = CompiledModel.load('titanic_rf_compiled', mmap_mode='r')
+    print(f"Compiled a '{compiled.meta['kind']}' model; arrays saved to 'titanic_rf_compiled/'")
+
+    X, _ = load_data()
+    records = X.to_dict(orient='records')
+    sk_predictions = loaded_model.predict(X)
+    compiled_predictions = compiled.predict(records)
+    max_diff = np.abs(loaded_model.predict_proba(X) - compiled.predict_proba(records)).max()
+    print(f"Predictions identical on all {len(X)} rows: {np.array_equal(sk_predictions, compiled_predictions)}")
+    print(f"Largest probability difference: {max_diff:.2e}")
+
+    sample_passenger = {'pclass': 3, 'sex': 'male', 'age': 22.0, 'sibsp': 1, 'parch': 0,
+                        'fare': 7.25, 'embarked': 'S'}
+    # The sklearn path includes building the one-row DataFrame, as in Titanic_ML.py
+    sklearn_seconds = _time_per_call(lambda: loaded_model.predict(pd.DataFrame([sample_passenger])), 50)
+    compiled_seconds = _time_per_call(lambda: compiled.predict(sample_passenger), 500)
+    print(f"\nSingle passenger, sklearn pipeline: {sklearn_seconds * 1e6:9.1f} us")
+    print(f"Single passenger, compiled NumPy:   {compiled_seconds * 1e6:9.1f} us "
+          f"({sklearn_seconds / compiled_seconds:.0f}x faster)")
+
+    sklearn_seconds = _time_per_call(lambda: loaded_model.predict(X), 5)
+    compiled_seconds = _time_per_call(lambda: compiled.predict(records), 5)
+    print(f"All {len(X)} rows, sklearn pipeline: {sklearn_seconds * 1e3:8.2f} ms")
+    print(f"All {len(X)} rows, compiled NumPy:   {compiled_seconds * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,254 @@
+# ============================================================
+# COMPRESSING THE RANDOM FOREST
+# ============================================================
+# The saved 100-tree forest is large, and prediction time grows with the
+# number of trees and their depth. This stage tries several smaller
+# versions of it and keeps the smallest one whose accuracy stays within a
+# budget (by default at most 1 point below the original).
+#
+# The choice is made on a validation split carved out of the training
+# rows; the test rows are only used afterwards, to report the accuracy of
+# every variant. (The forest itself was trained on the validation rows
+# too, so accuracies there are optimistic; the budget only compares them
+# with the original's on the same rows, and distilled students, which
+# never see them, are if anything judged strictly.)
+#
+# Variants, all built from the compiled form (Titanic_Compile.py):
+#   - fewer trees:     keep only the first k trees (they are independent,
+#                      so any k of them form a valid smaller forest)
+#   - depth pruning:   cut every tree at depth d; the cut nodes become
+#                      leaves predicting their training class mix
+#   - float32:         thresholds, probabilities and node ids stored in
+#                      32 bits (or less). Thresholds are rounded *down* to
+#                      float32; since features are compared as float32
+#                      anyway, the predictions do not change at all.
+#   - distillation:    train a small forest, or one gradient-boosted
+#                      model, to imitate the big forest on extra
+#                      synthetic passengers labelled by it
+#
+# The report shows artifact bytes, single-row and batch latency, validation
+# and test accuracy and agreement with the original forest for every variant.
+#
+# Run: python Titanic_Compression.py [titanic_rf_model.joblib] [max_accuracy_loss]
+# ============================================================
+
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+
+from Titanic_Compile import CompiledModel, compile_pipeline
+
+MAX_ACCURACY_LOSS = 0.01
+TREE_COUNTS = [50, 25, 10]
+DEPTHS = [12, 8, 6]
+TRANSFER_ROWS = 20_000
+VALIDATION_SIZE = 0.25  # share of the training rows used to choose a variant
+
+
+# ============================================================
+# 1. SHRINKING A COMPILED FOREST
+# ============================================================
+
+def shrink_forest(compiled, n_trees=None, max_depth=None):
+    """Keep the first `n_trees` trees, cut at `max_depth`, drop unreachable nodes."""
+    a = compiled.arrays
+    children = a['children'].reshape(-1, 2)
+    roots = a['roots'][:n_trees]
+
+    # Walk down level by level from the roots, collecting the nodes we keep
+    levels = []
+    frontier = roots
+    depth = 0
+    while len(frontier):
+        levels.append(frontier)
+        if max_depth is not None and depth == max_depth:
+            break  # this level becomes the leaves
+        left, right = children[frontier, 0], children[frontier, 1]
+        internal = left != frontier  # leaves point to themselves
+        frontier = np.concatenate([left[internal], right[internal]])
+        depth += 1
+
+    kept = np.concatenate(levels)
+    new_id = np.full(len(children), -1, dtype=np.intp)
+    new_id[kept] = np.arange(len(kept))
+    # A child that was not kept (cut off, or the node is a leaf) -> point to self
+    new_children = new_id[children[kept]]
+    new_children = np.where(new_children >= 0, new_children, np.arange(len(kept))[:, None])
+
+    arrays = dict(a)
+    arrays.update(
+        children=new_children.ravel().astype(a['children'].dtype),
+        feature=a['feature'][kept],
+        threshold=a['threshold'][kept],
+        leaf_proba=a['leaf_proba'][kept],
+        roots=new_id[roots].astype(a['roots'].dtype),
+    )
+    meta = dict(compiled.meta, max_depth=min(compiled.meta['max_depth'], depth))
+    return CompiledModel(arrays, meta)
+
+
+def quantize(compiled):
+    """Store the forest in 32-bit floats and the smallest integer types that fit."""
+    a = compiled.arrays
+    # Node ids must also hold 2 * node + 1, computed while walking the trees
+    node_dtype = np.min_scalar_type(2 * len(a['threshold']) + 1)
+    threshold = a['threshold'].astype(np.float32)
+    # Round down: for float32 x, "x <= t" and "x <= float32_floor(t)" agree exactly
+    threshold = np.where(threshold > a['threshold'], np.nextafter(threshold, np.float32(-np.inf)), threshold)
+    arrays = dict(a)
+    arrays.update(
+        children=a['children'].astype(node_dtype),
+        feature=a['feature'].astype(np.min_scalar_type(compiled.meta['n_features'])),
+        threshold=threshold.astype(np.float32),
+        leaf_proba=a['leaf_proba'].astype(np.float32),
+        roots=a['roots'].astype(node_dtype),
+    )
+    return CompiledModel(arrays, dict(compiled.meta))
+
+
+# ============================================================
+# 2. DISTILLATION INTO A SMALLER MODEL
+# ============================================================
+
+def distill(teacher, student, X_train, y_train, n_rows=TRANSFER_ROWS):
+    """Fit `student` on synthetic passengers labelled by `teacher`."""
+    from Titanic_Benchmark import upsample
+    X_transfer, _ = upsample(X_train, y_train, n_rows, seed=1)
+    X_transfer = pd.concat([X_train, X_transfer], ignore_index=True)
+    return student.fit(X_transfer, teacher.predict(X_transfer))
+
+
+def student_pipelines(teacher):
+    # Fresh copies, so fitting a student leaves the teacher's preprocessor alone
+    preprocessor = teacher.named_steps['preprocessor']
+    return {
+        'distilled forest (20 trees, depth 8)': Pipeline([
+            ('preprocessor', clone(preprocessor)),
+            ('classifier', RandomForestClassifier(n_estimators=20, max_depth=8, random_state=42))]),
+        'distilled gradient boosting': Pipeline([
+            ('preprocessor', clone(preprocessor)),
+            ('classifier', HistGradientBoostingClassifier(max_iter=100, max_depth=6, random_state=42))]),
+    }
+
+
+# ============================================================
+# 3. MEASURING A VARIANT
+# ============================================================
+
+def artifact_bytes(model):
+    with tempfile.TemporaryDirectory() as tmp:
+        if isinstance(model, CompiledModel):
+            model.save(tmp)
+        else:
+            joblib.dump(model, os.path.join(tmp, 'model.joblib'))
+        return sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+
+
+def _time_per_call(fn, repeats):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def _inputs(model, X):
+    """X as the model takes it: records for a CompiledModel, else the DataFrame."""
+    return X.to_dict(orient='records') if isinstance(model, CompiledModel) else X
+
+
+def accuracy(model, X, y):
+    return float(np.mean(np.asarray(model.predict(_inputs(model, X))) == np.asarray(y)))
+
+
+def measure(model, X_test, y_test, teacher_predictions):
+    """Size, latency, test accuracy and agreement with the teacher of one variant."""
+    inputs = _inputs(model, X_test)
+    one = inputs[0] if isinstance(model, CompiledModel) else X_test.iloc[:1]
+    predictions = np.asarray(model.predict(inputs))
+    return {
+        'bytes': artifact_bytes(model),
+        'single_row_us': _time_per_call(lambda: model.predict(one), 100) * 1e6,
+        'batch_ms': _time_per_call(lambda: model.predict(inputs), 10) * 1e3,
+        'accuracy': float(np.mean(predictions == np.asarray(y_test))),
+        'agreement': float(np.mean(predictions == teacher_predictions)),
+    }
+
+
+def compress(teacher, X_train, y_train, X_test, y_test, max_accuracy_loss=MAX_ACCURACY_LOSS):
+    """Build every variant and pick the smallest within the budget on a
+    validation split of the training rows; measure them all on the test rows."""
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train, y_train, test_size=VALIDATION_SIZE, random_state=42, stratify=y_train)
+    teacher_predictions = teacher.predict(X_test)
+    compiled = compile_pipeline(teacher)
+    variants = {'original (sklearn)': teacher, 'compiled': compiled, 'compiled float32': quantize(compiled)}
+    for n_trees in TREE_COUNTS:
+        variants[f'{n_trees} trees, float32'] = quantize(shrink_forest(compiled, n_trees=n_trees))
+    for depth in DEPTHS:
+        variants[f'depth {depth}, float32'] = quantize(shrink_forest(compiled, max_depth=depth))
+    variants['25 trees, depth 8, float32'] = quantize(shrink_forest(compiled, n_trees=25, max_depth=8))
+    for name, student in student_pipelines(teacher).items():
+        student = distill(teacher, student, X_fit, y_fit)
+        if isinstance(student.named_steps['classifier'], RandomForestClassifier):
+            student = quantize(compile_pipeline(student))
+        variants[name] = student
+
+    results = {name: {'val_accuracy': accuracy(model, X_val, y_val),
+                      **measure(model, X_test, y_test, teacher_predictions)}
+               for name, model in variants.items()}
+    floor = results['original (sklearn)']['val_accuracy'] - max_accuracy_loss
+    eligible = [name for name, r in results.items() if r['val_accuracy'] >= floor]
+    best = min(eligible, key=lambda name: (results[name]['bytes'], results[name]['single_row_us']))
+    return variants, results, best
+
+
+def print_report(results, best, max_accuracy_loss):
+    base = results['original (sklearn)']
+    print(f"{'variant':<38}{'KB':>9}{'1 row us':>10}{'batch ms':>10}{'val acc':>9}{'test acc':>10}{'agree':>8}")
+    for name, r in results.items():
+        marker = '*' if name == best else ' '
+        print(f"{marker}{name:<37}{r['bytes'] / 1024:>9.1f}{r['single_row_us']:>10.1f}"
+              f"{r['batch_ms']:>10.2f}{r['val_accuracy']:>9.4f}{r['accuracy']:>10.4f}{r['agreement']:>8.3f}")
+    r = results[best]
+    print(f"\nChosen on the validation rows (accuracy loss <= {max_accuracy_loss:.3f}): {best}")
+    print(f"  size {base['bytes'] / r['bytes']:.0f}x smaller, single row "
+          f"{base['single_row_us'] / r['single_row_us']:.0f}x faster, batch "
+          f"{base['batch_ms'] / r['batch_ms']:.0f}x faster, "
+          f"test accuracy {r['accuracy'] - base['accuracy']:+.4f}")
+
+
+def main(model_path='titanic_rf_model.joblib', max_accuracy_loss=MAX_ACCURACY_LOSS):
+    from sklearn.model_selection import train_test_split
+    from Titanic_ML import load_data
+
+    print("=" * 50)
+    print("COMPRESSING THE RANDOM FOREST")
+    print("=" * 50)
+    teacher = joblib.load(model_path)
+    X, y = load_data()
+    # The same split as Titanic_ML.py, so the test rows are unseen by the teacher
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+    variants, results, best = compress(teacher, X_train, y_train, X_test, y_test, max_accuracy_loss)
+    print_report(results, best, max_accuracy_loss)
+    chosen = variants[best]
+    if isinstance(chosen, CompiledModel):
+        chosen.save('titanic_rf_compressed')
+        print("Saved to 'titanic_rf_compressed/' (load with CompiledModel.load)")
+    else:
+        joblib.dump(chosen, 'titanic_rf_compressed.joblib')
+        print("Saved to 'titanic_rf_compressed.joblib'")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2], *[float(v) for v in sys.argv[2:3]])
@@ -0,0 +1,333 @@
+# ============================================================
+# INPUT DRIFT MONITORING WITH CONSTANT-MEMORY SKETCHES
+# ============================================================
+# A model is only as good as the match between the data it was trained
+# on and the data it is asked about. If passengers suddenly get older, or
+# the share of first-class tickets doubles, accuracy can quietly drop.
+#
+# Storing every request to compare it with the training data is not an
+# option, so each feature is summarized by a small "sketch":
+#   - numeric (age, fare):          a t-digest -- a few hundred weighted
+#                                   centroids that approximate the whole
+#                                   distribution, most precisely in the tails
+#   - categorical (sex, embarked,
+#     pclass):                      a count per category (+ other, + missing)
+# Both kinds are *mergeable*: two sketches can be added into one.
+# (The t-digest lives in Libraries/pandas/Pandas_OutOfCore.py, so other
+# projects can use it as a quantile sketch too.)
+#
+# Sliding window: traffic goes into a ring of N_BUCKETS buckets of
+# BUCKET_SIZE rows each (the newest one still filling); when a new bucket
+# starts, the oldest is dropped. A check merges the buckets and compares
+# them with the training snapshot:
+#   - PSI (population stability index) over training-decile bins,
+#     with missing values as their own bin
+#   - KS: largest gap between the two cumulative distributions
+# Both are computed from the sketches alone, so a check costs
+# O(sketch size), no matter how much traffic was seen.
+#
+# Run: python Titanic_Drift.py
+# (writes the training snapshot used by Titanic_Serving.py's /drift)
+# ============================================================
+
+import json
+import os
+import sys
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Libraries', 'pandas'))
+from Pandas_OutOfCore import TDigest  # noqa: E402
+
+NUMERIC_FEATURES = ['age', 'fare']
+CATEGORICAL_FEATURES = ['sex', 'embarked', 'pclass']
+REFERENCE_PATH = 'titanic_drift_reference.json'
+
+COMPRESSION = 200       # about COMPRESSION / 2 centroids per digest
+BUCKET_SIZE = 500
+N_BUCKETS = 10
+MIN_ROWS = 200          # fewer rows than this in the window: no verdict yet
+PSI_ALERT = 0.2         # common rule of thumb: > 0.2 is a significant shift
+KS_ALERT = 0.1
+EPSILON = 1e-4          # keeps empty bins from making PSI infinite
+
+
+# ============================================================
+# 1. SKETCHES
+# ============================================================
+
+class NumericSketch:
+    """A t-digest of the present values plus a missing-value count."""
+
+    def __init__(self, compression=COMPRESSION):
+        self.digest = TDigest(compression)
+        self.missing = 0
+
+    def update(self, values):
+        values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float)
+        self.missing += int(np.isnan(values).sum())
+        self.digest.update(values)
+
+    def merge(self, other):
+        self.digest.merge(other.digest)
+        self.missing += other.missing
+        return self
+
+    @property
+    def count(self):
+        return self.digest.count + self.missing
+
+    def to_dict(self):
+        return {'digest': self.digest.to_dict(), 'missing': self.missing}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls()
+        sketch.digest = TDigest.from_dict(data['digest'])
+        sketch.missing = data['missing']
+        return sketch
+
+
+class CategorySketch:
+    """Counts per known category, plus 'other' and 'missing'."""
+
+    def __init__(self, categories):
+        self.categories = list(categories)
+        self._index = {c: i for i, c in enumerate(self.categories)}
+        self.counts = np.zeros(len(self.categories) + 2, dtype=np.int64)  # ..., other, missing
+
+    def update(self, values):
+        values = pd.Series(values, dtype=object)
+        missing = values.isna().to_numpy()
+        codes = values.map(self._index).to_numpy(dtype=float)
+        codes = np.where(missing, len(self.categories) + 1,
+                         np.where(np.isnan(codes), len(self.categories), codes)).astype(np.intp)
+        self.counts += np.bincount(codes, minlength=len(self.counts))
+
+    def merge(self, other):
+        self.counts += other.counts
+        return self
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def to_dict(self):
+        return {'categories': self.categories, 'counts': self.counts.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['categories'])
+        sketch.counts = np.array(data['counts'], dtype=np.int64)
+        return sketch
+
+
+def _builtin(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def sketch_frame(frame, categories):
+    """{feature: sketch} of a DataFrame, for the monitored features."""
+    sketches = {}
+    for feature in NUMERIC_FEATURES:
+        sketches[feature] = NumericSketch()
+        sketches[feature].update(frame[feature])
+    for feature in CATEGORICAL_FEATURES:
+        sketches[feature] = CategorySketch(categories[feature])
+        sketches[feature].update(frame[feature].astype(object))
+    return sketches
+
+
+# ============================================================
+# 2. DRIFT STATISTICS FROM TWO SKETCHES
+# ============================================================
+
+def _psi(expected, actual):
+    expected = np.maximum(expected, EPSILON)
+    actual = np.maximum(actual, EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def numeric_drift(reference, current, n_bins=10):
+    """PSI over the reference's quantile bins (+ a missing bin) and KS."""
+    ref, cur = reference.digest, current.digest
+    edges = np.unique(ref.quantile(np.linspace(0, 1, n_bins + 1)[1:-1]))
+
+    def bin_shares(sketch):
+        present = sketch.digest.count
+        total = present + sketch.missing
+        if present:
+            cdf = np.r_[0.0, sketch.digest.cdf(edges), 1.0]
+            shares = np.diff(cdf) * present / total
+        else:
+            shares = np.zeros(len(edges) + 1)
+        return np.r_[shares, sketch.missing / total]
+
+    ks = None
+    if ref.count and cur.count:
+        points = np.concatenate([ref.means, cur.means])
+        ks = float(np.max(np.abs(ref.cdf(points) - cur.cdf(points))))
+    return {'psi': _psi(bin_shares(reference), bin_shares(current)), 'ks': ks,
+            'missing_rate': current.missing / current.count,
+            'reference_missing_rate': reference.missing / reference.count}
+
+
+def categorical_drift(reference, current):
+    expected = reference.counts / reference.counts.sum()
+    actual = current.counts / current.counts.sum()
+    labels = [str(c) for c in reference.categories] + ['other', 'missing']
+    return {'psi': _psi(expected, actual),
+            'shares': dict(zip(labels, np.round(actual, 4).tolist())),
+            'reference_shares': dict(zip(labels, np.round(expected, 4).tolist()))}
+
+
+# ============================================================
+# 3. THE TRAINING SNAPSHOT AND THE MONITOR
+# ============================================================
+
+class DriftReference:
+    """Sketches of the training data, saved as JSON next to the model."""
+
+    def __init__(self, sketches):
+        self.sketches = sketches
+        self.categories = {f: sketches[f].categories for f in CATEGORICAL_FEATURES}
+
+    @classmethod
+    def from_frame(cls, frame):
+        categories = {f: sorted(_builtin(v) for v in frame[f].dropna().unique()) for f in CATEGORICAL_FEATURES}
+        return cls(sketch_frame(frame, categories))
+
+    def save(self, path=REFERENCE_PATH):
+        with open(path, 'w') as f:
+            json.dump({feature: sketch.to_dict() for feature, sketch in self.sketches.items()}, f)
+
+    @classmethod
+    def load(cls, path=REFERENCE_PATH):
+        with open(path) as f:
+            data = json.load(f)
+        sketches = {f: NumericSketch.from_dict(data[f]) for f in NUMERIC_FEATURES}
+        sketches.update({f: CategorySketch.from_dict(data[f]) for f in CATEGORICAL_FEATURES})
+        return cls(sketches)
+
+
+class DriftMonitor:
+    """Sketches of the recent traffic in a ring of buckets, compared on demand."""
+
+    def __init__(self, reference, bucket_size=BUCKET_SIZE, n_buckets=N_BUCKETS):
+        self.reference = reference
+        self.bucket_size = bucket_size
+        self.buckets = deque(maxlen=n_buckets)  # the oldest bucket falls out
+        self.rows_seen = 0
+        self._current_rows = 0
+        self._lock = threading.Lock()
+        self._new_bucket()
+
+    def _new_bucket(self):
+        empty = pd.DataFrame({f: pd.Series(dtype=object) for f in NUMERIC_FEATURES + CATEGORICAL_FEATURES})
+        self.buckets.append(sketch_frame(empty, self.reference.categories))
+        self._current_rows = 0
+
+    def observe(self, rows):
+        """Add a DataFrame (or a list of row dicts) of model inputs."""
+        frame = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame.from_records(rows)
+        with self._lock:
+            start = 0
+            while start < len(frame):
+                take = min(self.bucket_size - self._current_rows, len(frame) - start)
+                part = frame.iloc[start:start + take]
+                for feature, sketch in self.buckets[-1].items():
+                    sketch.update(part[feature].astype(object) if feature in CATEGORICAL_FEATURES
+                                  else part[feature])
+                self._current_rows += take
+                self.rows_seen += take
+                start += take
+                if self._current_rows >= self.bucket_size:
+                    self._new_bucket()
+
+    def _window(self):
+        merged = {}
+        for feature in NUMERIC_FEATURES:
+            merged[feature] = NumericSketch()
+            for bucket in self.buckets:
+                merged[feature].merge(bucket[feature])
+        for feature in CATEGORICAL_FEATURES:
+            merged[feature] = CategorySketch(self.reference.categories[feature])
+            for bucket in self.buckets:
+                merged[feature].merge(bucket[feature])
+        return merged
+
+    def check(self):
+        """Drift statistics of the current window against the training snapshot."""
+        with self._lock:
+            window = self._window()
+        window_rows = window[CATEGORICAL_FEATURES[0]].count
+        report = {'window_rows': window_rows, 'rows_seen': self.rows_seen, 'features': {}}
+        if window_rows < MIN_ROWS:
+            report['status'] = f'waiting for {MIN_ROWS} rows'
+            return report
+        for feature in NUMERIC_FEATURES:
+            stats = numeric_drift(self.reference.sketches[feature], window[feature])
+            stats['drift'] = stats['psi'] > PSI_ALERT or (stats['ks'] or 0) > KS_ALERT
+            report['features'][feature] = stats
+        for feature in CATEGORICAL_FEATURES:
+            stats = categorical_drift(self.reference.sketches[feature], window[feature])
+            stats['drift'] = stats['psi'] > PSI_ALERT
+            report['features'][feature] = stats
+        drifted = [f for f, s in report['features'].items() if s['drift']]
+        report['status'] = 'drift' if drifted else 'ok'
+        report['drifted_features'] = drifted
+        return report
+
+
+# ============================================================
+# 4. DEMO: WRITE THE SNAPSHOT, THEN SIMULATE TRAFFIC
+# ============================================================
+
+def print_report(title, report):
+    print(f"\n{title}: {report['status']} ({report['window_rows']:.0f} rows in the window)")
+    for feature, stats in report['features'].items():
+        ks = f"  KS {stats['ks']:.3f}" if stats.get('ks') is not None else ''
+        print(f"  {feature:<9} PSI {stats['psi']:.3f}{ks}{'  <-- DRIFT' if stats['drift'] else ''}")
+
+
+def main():
+    import time
+    from sklearn.model_selection import train_test_split
+    from Titanic_Benchmark import upsample
+    from Titanic_ML import load_data
+
+    print("=" * 50)
+    print("INPUT DRIFT MONITORING")
+    print("=" * 50)
+    X, y = load_data()
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    reference = DriftReference.from_frame(X_train)
+    reference.save(REFERENCE_PATH)
+    print(f"Training snapshot written to '{REFERENCE_PATH}'")
+
+    # Traffic that looks like the training data...
+    monitor = DriftMonitor(DriftReference.load(REFERENCE_PATH))
+    traffic, _ = upsample(X_test, y_test, BUCKET_SIZE * N_BUCKETS, seed=2)
+    monitor.observe(traffic)
+    print_report("Traffic like the training data", monitor.check())
+
+    # ...then older, richer passengers who mostly board in Cherbourg
+    shifted = traffic.copy()
+    shifted['age'] = shifted['age'] + 15
+    shifted['fare'] = shifted['fare'] * 3
+    shifted['embarked'] = np.where(np.random.default_rng(3).random(len(shifted)) < 0.7, 'C', shifted['embarked'])
+    for start in range(0, len(shifted), 100):  # arrives in small batches, like served requests
+        monitor.observe(shifted.iloc[start:start + 100])
+    start = time.perf_counter()
+    report = monitor.check()
+    check_ms = (time.perf_counter() - start) * 1000
+    print_report("Shifted traffic", report)
+    print(f"\nOne check took {check_ms:.1f} ms after {monitor.rows_seen:,} rows; "
+          f"the window holds {N_BUCKETS} buckets of sketches, not the rows")
+
+
+if __name__ == "__main__":
+    main()
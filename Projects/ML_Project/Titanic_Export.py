@@ -0,0 +1,252 @@
+# ============================================================
+# PORTABLE INFERENCE: EXPORTING THE PIPELINES TO ONNX
+# ============================================================
+# Serving 'titanic_rf_model.joblib' means every worker imports pandas,
+# scipy and scikit-learn and unpickles the pipeline -- slow to start and
+# heavy on memory, just to run a few comparisons per tree.
+#
+# ONNX is a portable file format for inference graphs. skl2onnx converts
+# the *whole* fitted pipeline (imputers, scaler, one-hot encoder and the
+# classifier) into one graph, which onnxruntime runs without sklearn,
+# pandas or even Python objects for the model. Each input column becomes
+# a separate graph input: numbers as float, the categorical columns as
+# strings.
+#
+# skl2onnx needs all columns of one transformer to share a type, so the
+# categorical step gets pclass as text too ('1', '2', '3'): export_onnx()
+# converts a copy of the fitted pipeline whose imputer statistics and
+# one-hot categories are the same values written as strings. No refit,
+# so the exported graph is the trained model.
+#
+# One difference remains: the graph scales the numbers in float32, while
+# sklearn scales in float64 and rounds afterwards. A value right on a
+# split point can then go the other way in a few trees, so the forest's
+# probabilities may differ slightly on some rows; the parity check counts
+# them. (onnxruntime has no float64 imputer, so float64 inputs are not an
+# option.)
+#
+# This script exports the fitted pipeline(s) saved by Titanic_ML.py, checks
+# that ONNX gives the same predictions as sklearn on the test passengers
+# (rows the model was not trained on), and compares
+#   - cold start: a fresh process importing the runtime, loading the model
+#     and making the first prediction
+#   - peak memory (RSS) of that process
+#   - latency for one passenger
+# for sklearn, onnxruntime and the NumPy-only model from Titanic_Compile.py.
+#
+# Needs: pip install skl2onnx onnxruntime
+# Run: python Titanic_Export.py [titanic_rf_model.joblib ...]
+# ============================================================
+
+import copy
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from Titanic_Memory import peak_rss_mb  # standard library only, cheap to import
+
+# How each input column is typed in the ONNX graph
+NUMERIC_INPUTS = ['age', 'fare', 'sibsp', 'parch']
+STRING_INPUTS = ['pclass', 'sex', 'embarked']
+EXPORT_DIR = 'titanic_onnx'
+
+
+# ============================================================
+# 1. EXPORT
+# ============================================================
+
+def _export_copy(pipeline):
+    """A copy of the fitted pipeline that converts to ONNX without changing predictions."""
+    pipeline = copy.deepcopy(pipeline)
+    cat_pipe = pipeline.named_steps['preprocessor'].named_transformers_['cat']
+    imputer = cat_pipe.named_steps['imputer']
+    imputer.statistics_ = np.array([str(v) for v in imputer.statistics_], dtype=object)
+    imputer.missing_values = ''  # the ONNX graph marks missing text as ''
+    encoder = cat_pipe.named_steps['onehot']
+    encoder.categories_ = [np.array([str(c) for c in categories], dtype=object)
+                           for categories in encoder.categories_]
+
+    # ONNX stores tree thresholds as float32. Rounding them *down* keeps
+    # "x <= threshold" exact for float32 inputs (see Titanic_Compression.py)
+    for tree in getattr(pipeline.named_steps['classifier'], 'estimators_', []):
+        threshold = tree.tree_.threshold  # a writable view of the tree's nodes
+        rounded = threshold.astype(np.float32)
+        rounded = np.where(rounded > threshold, np.nextafter(rounded, np.float32(-np.inf)), rounded)
+        threshold[:] = rounded
+    return pipeline
+
+
+def export_onnx(pipeline, path):
+    """Convert a fitted Titanic pipeline into an ONNX file."""
+    from skl2onnx import convert_sklearn  # optional dependency, only needed for exporting
+    from skl2onnx.common.data_types import FloatTensorType, StringTensorType
+
+    pipeline = _export_copy(pipeline)
+    initial_types = ([(c, FloatTensorType([None, 1])) for c in NUMERIC_INPUTS]
+                     + [(c, StringTensorType([None, 1])) for c in STRING_INPUTS])
+    classifier = pipeline.named_steps['classifier']
+    # zipmap=False: probabilities as a plain (n, 2) tensor instead of a list of dicts
+    onnx_model = convert_sklearn(pipeline, initial_types=initial_types,
+                                 options={id(classifier): {'zipmap': False}},
+                                 target_opset=17)
+    with open(path, 'wb') as f:
+        f.write(onnx_model.SerializeToString())
+    return path
+
+
+# ============================================================
+# 2. RUNNING THE EXPORTED GRAPH
+# ============================================================
+
+class OnnxModel:
+    """predict / predict_proba on row dicts, backed by onnxruntime."""
+
+    def __init__(self, path):
+        import onnxruntime as ort  # optional dependency
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = 1  # one request at a time; scale with processes
+        self.session = ort.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        self.output_names = [o.name for o in self.session.get_outputs()]
+
+    @staticmethod
+    def feeds(rows):
+        """Row dicts -> one (n, 1) array per graph input."""
+        if isinstance(rows, dict):
+            rows = [rows]
+        feeds = {}
+        for column in NUMERIC_INPUTS:
+            values = [row.get(column) for row in rows]
+            feeds[column] = np.array([np.nan if v is None else v for v in values], dtype=np.float32)[:, None]
+        for column in STRING_INPUTS:
+            # Missing values are passed as '' (the exported imputer's missing marker)
+            values = [row.get(column) for row in rows]
+            feeds[column] = np.array(['' if v is None or v != v else str(v) for v in values],
+                                     dtype=object)[:, None]
+        return feeds
+
+    def predict_proba(self, rows):
+        labels, probabilities = self.session.run(self.output_names, self.feeds(rows))
+        return probabilities
+
+    def predict(self, rows):
+        labels, probabilities = self.session.run(self.output_names, self.feeds(rows))
+        return labels
+
+
+# ============================================================
+# 3. PARITY CHECK
+# ============================================================
+
+def check_parity(pipeline, onnx_model, X):
+    """Compare ONNX with sklearn on every row of X."""
+    records = X.astype(object).where(X.notna(), None).to_dict(orient='records')
+    difference = np.abs(pipeline.predict_proba(X) - onnx_model.predict_proba(records)).max(axis=1)
+    return {
+        'rows': len(X),
+        'same_predictions': float(np.mean(pipeline.predict(X) == onnx_model.predict(records))),
+        'rows_with_different_probabilities': int((difference > 1e-6).sum()),
+        'max_probability_difference': float(difference.max()),
+    }
+
+
+# ============================================================
+# 4. COLD START, MEMORY AND LATENCY IN A FRESH PROCESS
+# ============================================================
+
+SAMPLE_PASSENGER = {'pclass': 3, 'sex': 'male', 'age': 22.0, 'sibsp': 1, 'parch': 0,
+                    'fare': 7.25, 'embarked': 'S'}
+
+
+def _cold_start(runtime, path, results):
+    """Import the runtime, load the model and predict once; report timings."""
+    start = time.perf_counter()
+    if runtime == 'sklearn':
+        import joblib
+        import pandas as pd
+        model = joblib.load(path)
+        predict_one = lambda: model.predict(pd.DataFrame([SAMPLE_PASSENGER]))  # noqa: E731
+    elif runtime == 'onnxruntime':
+        model = OnnxModel(path)
+        predict_one = lambda: model.predict(SAMPLE_PASSENGER)  # noqa: E731
+    else:
+        from Titanic_Compile import CompiledModel
+        model = CompiledModel.load(path)
+        predict_one = lambda: model.predict(SAMPLE_PASSENGER)  # noqa: E731
+    predict_one()
+    cold_start = time.perf_counter() - start
+
+    repeats = 200
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predict_one()
+    per_row = (time.perf_counter() - start) / repeats
+
+    modules_loaded = len(sys.modules)
+    results.put({'runtime': runtime, 'cold_start_ms': cold_start * 1000,
+                 'peak_rss_mb': peak_rss_mb(), 'single_row_us': per_row * 1e6,
+                 'modules_loaded': modules_loaded})
+
+
+def benchmark_runtime(runtime, path):
+    # spawn: a clean interpreter, so imports are really paid for
+    ctx = multiprocessing.get_context('spawn')
+    results = ctx.Queue()
+    process = ctx.Process(target=_cold_start, args=(runtime, path, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main(*model_paths):
+    import joblib
+    from sklearn.model_selection import train_test_split
+    from Titanic_ML import load_data
+    from Titanic_Compile import compile_pipeline
+
+    print("=" * 50)
+    print("ONNX EXPORT")
+    print("=" * 50)
+    try:
+        import skl2onnx  # noqa: F401
+        import onnxruntime  # noqa: F401
+    except ImportError:
+        print("skl2onnx and onnxruntime are needed: pip install skl2onnx onnxruntime")
+        return
+
+    X, y = load_data()
+    # The same split as Titanic_ML.py, so the parity rows are unseen by the model
+    _, X_test, _, _ = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    rows = []
+    for sklearn_path in model_paths or ['titanic_rf_model.joblib']:
+        name = os.path.splitext(os.path.basename(sklearn_path))[0]
+        pipeline = joblib.load(sklearn_path)
+        onnx_path = export_onnx(pipeline, os.path.join(EXPORT_DIR, f'{name}.onnx'))
+        compiled_path = os.path.join(EXPORT_DIR, f'{name}_compiled')
+        compile_pipeline(pipeline).save(compiled_path)
+
+        parity = check_parity(pipeline, OnnxModel(onnx_path), X_test)
+        print(f"\n{name}: exported to '{onnx_path}' ({os.path.getsize(onnx_path) / 1024:.0f} KB)")
+        print(f"  parity on {parity['rows']} rows: {parity['same_predictions']:.2%} identical predictions, "
+              f"{parity['rows_with_different_probabilities']} row(s) with different probabilities "
+              f"(max difference {parity['max_probability_difference']:.2e})")
+
+        for runtime, path in [('sklearn', sklearn_path), ('onnxruntime', onnx_path),
+                              ('compiled NumPy', compiled_path)]:
+            result = benchmark_runtime(runtime, path)
+            rows.append({'model': name, **result})
+            print(f"  {runtime:<15} cold start {result['cold_start_ms']:7.0f} ms, "
+                  f"peak RSS {result['peak_rss_mb']:5.0f} MB, one row {result['single_row_us']:8.1f} us, "
+                  f"{result['modules_loaded']} modules imported")
+
+    with open(os.path.join(EXPORT_DIR, 'benchmark.json'), 'w') as f:
+        json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,218 @@
+# ============================================================
+# CONTENT-ADDRESSED FEATURE STORE
+# ============================================================
+# Every run of Titanic_ML.py rebuilds X and y from the raw frame and runs
+# them through the ColumnTransformer again. The result is always the same
+# as long as the data and the transformer settings have not changed.
+#
+# The feature store saves that result once, as plain .npy files:
+#   <root>/<key>/X.npy          the transformed design matrix (float64)
+#   <root>/<key>/y.npy          the target
+#   <root>/<key>/meta.json      column names, shapes, what the key was made of
+#   <root>/<key>/transformer.joblib   the fitted transformer
+#
+# The key is a hash of the source data (values, columns, dtypes) and of
+# the transformer's configuration, so changing either one gives a new
+# entry and a stale matrix can never be picked up by mistake.
+#
+# Entries are opened with np.load(mmap_mode='r'): nothing is copied into
+# the process, and several processes reading the same entry share one
+# copy of it in the OS page cache.
+#
+# Usage:
+# store = FeatureStore()
+# train = store.fit_transform(build_preprocessor(), X_train, y_train)
+# test = store.transform(train, X_test, y_test)
+# classifier.fit(train.X, train.y); classifier.score(test.X, test.y)
+#
+# Run: python Titanic_FeatureStore.py
+# ============================================================
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import clone
+
+FEATURE_STORE_DIR = os.path.join('.cache', 'features')
+FORMAT_VERSION = 1
+
+
+# ============================================================
+# 1. KEYS: WHAT THE MATRIX WAS MADE FROM
+# ============================================================
+
+def data_fingerprint(X, y=None):
+    """Hash of the frame's values, column names and dtypes (and of y)."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[c, str(t)] for c, t in X.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    if y is not None:
+        digest.update(pd.util.hash_pandas_object(pd.Series(y), index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def transformer_fingerprint(transformer):
+    """Hash of the transformer's configuration (its parameters, not its fit)."""
+    return joblib.hash(clone(transformer).get_params(deep=True))
+
+
+def _key(*parts):
+    return hashlib.sha256('/'.join(parts).encode()).hexdigest()[:32]
+
+
+# ============================================================
+# 2. ONE STORED MATRIX
+# ============================================================
+
+class FeatureMatrix:
+    """A stored design matrix, opened as read-only memory maps."""
+
+    def __init__(self, directory, mmap_mode='r'):
+        self.directory = directory
+        self.key = os.path.basename(directory)
+        with open(os.path.join(directory, 'meta.json')) as f:
+            self.meta = json.load(f)
+        # np.asarray keeps the memory map but drops the np.memmap subclass
+        self.X = np.asarray(np.load(os.path.join(directory, 'X.npy'), mmap_mode=mmap_mode))
+        y_path = os.path.join(directory, 'y.npy')
+        self.y = np.asarray(np.load(y_path, mmap_mode=mmap_mode)) if os.path.exists(y_path) else None
+        self.columns = self.meta['columns']
+        self._transformer = None
+
+    @property
+    def transformer(self):
+        """The fitted transformer that produced this matrix (loaded on first use)."""
+        if self._transformer is None:
+            self._transformer = joblib.load(os.path.join(self.directory, 'transformer.joblib'))
+        return self._transformer
+
+    def __repr__(self):
+        return f"FeatureMatrix(key={self.key!r}, shape={self.X.shape})"
+
+
+# ============================================================
+# 3. THE STORE
+# ============================================================
+
+class FeatureStore:
+    """Design matrices on disk, addressed by what they were computed from."""
+
+    def __init__(self, root=FEATURE_STORE_DIR):
+        self.root = root
+
+    def _path(self, key):
+        return os.path.join(self.root, key)
+
+    def open(self, key, mmap_mode='r'):
+        return FeatureMatrix(self._path(key), mmap_mode=mmap_mode)
+
+    def fit_transform(self, transformer, X, y=None):
+        """Fit `transformer` on X and store the result, unless it is stored already."""
+        key = _key('fit', transformer_fingerprint(transformer), data_fingerprint(X, y))
+        if not os.path.isdir(self._path(key)):
+            fitted = clone(transformer)
+            X_out = fitted.fit_transform(X, y)
+            self._write(key, X_out, y, fitted, X, {
+                'transformer_hash': transformer_fingerprint(transformer),
+                'data_hash': data_fingerprint(X, y),
+            })
+        return self.open(key)
+
+    def transform(self, fitted_matrix, X, y=None):
+        """Apply the transformer behind `fitted_matrix` to new data (e.g. a test set)."""
+        key = _key('transform', fitted_matrix.key, data_fingerprint(X, y))
+        if not os.path.isdir(self._path(key)):
+            transformer = fitted_matrix.transformer
+            self._write(key, transformer.transform(X), y, transformer, X, {
+                'fitted_on': fitted_matrix.key,
+                'data_hash': data_fingerprint(X, y),
+            })
+        return self.open(key)
+
+    def _write(self, key, X_out, y, transformer, X_source, provenance):
+        if sparse.issparse(X_out):
+            X_out = X_out.toarray()
+        os.makedirs(self.root, exist_ok=True)
+        # Build the entry in a temporary folder and rename it into place, so
+        # a reader (or a crashed writer) never leaves a half-written entry
+        tmp = tempfile.mkdtemp(dir=self.root, prefix='.tmp-')
+        try:
+            np.save(os.path.join(tmp, 'X.npy'), np.ascontiguousarray(X_out, dtype=np.float64))
+            if y is not None:
+                np.save(os.path.join(tmp, 'y.npy'), np.asarray(y))
+            joblib.dump(transformer, os.path.join(tmp, 'transformer.joblib'))
+            meta = {
+                'format_version': FORMAT_VERSION,
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'shape': list(X_out.shape),
+                'columns': [str(c) for c in transformer.get_feature_names_out()],
+                'source_columns': [{'name': c, 'dtype': str(t)} for c, t in X_source.dtypes.items()],
+                **provenance,
+            }
+            with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+                json.dump(meta, f, indent=2)
+            os.rename(tmp, self._path(key))
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.isdir(self._path(key)):  # not a concurrent writer winning the race
+                raise
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    def keys(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(k for k in os.listdir(self.root) if not k.startswith('.'))
+
+
+# ============================================================
+# 4. DEMO: COLD VS WARM, TRAINING FROM THE MAP, SHARED READERS
+# ============================================================
+
+def _column_means(directory):
+    """Worker: open the stored matrix and read all of it."""
+    matrix = FeatureMatrix(directory)
+    return matrix.X.mean(axis=0)
+
+
+def main():
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import train_test_split
+    from Titanic_ML import load_data, build_preprocessor
+
+    print("=" * 50)
+    print("CONTENT-ADDRESSED FEATURE STORE")
+    print("=" * 50)
+    X, y = load_data()
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    store = FeatureStore()
+
+    for attempt in ['first', 'second']:
+        start = time.perf_counter()
+        train = store.fit_transform(build_preprocessor(), X_train, y_train)
+        test = store.transform(train, X_test, y_test)
+        print(f"{attempt} call: {(time.perf_counter() - start) * 1000:7.1f} ms -> {train}, {test}")
+    print(f"Columns: {train.columns}")
+
+    classifier = RandomForestClassifier(n_estimators=100, random_state=42)
+    classifier.fit(train.X, train.y)
+    print(f"Random Forest trained on the memory map; test accuracy {classifier.score(test.X, test.y):.4f}")
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(_column_means, [train.directory] * 2))
+    print(f"2 worker processes read the same entry: identical results {np.array_equal(*results)}")
+    print(f"Entries in '{store.root}': {len(store.keys())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# ============================================================
+# PERMUTATION FEATURE IMPORTANCE, BATCHED AND IN PARALLEL
+# ============================================================
+# Which of the input columns does a model actually rely on? Shuffle one
+# column of the test set, and see how much the accuracy drops. Repeat a
+# few times per column to get an error bar.
+#
+# Done naively (sklearn.inspection.permutation_importance on the whole
+# pipeline) that is n_features x n_repeats separate predict calls, each
+# re-running the preprocessing, on one core.
+#
+# Here:
+#   - the preprocessed test matrix comes from the feature store
+#     (Titanic_FeatureStore.py), so preprocessing runs at most once
+#   - shuffling a raw column = shuffling its group of preprocessed
+#     columns together ('sex' -> cat__sex_female, cat__sex_male)
+#   - all n_repeats shuffled copies of the matrix are stacked into ONE
+#     array and scored with ONE predict call
+#   - the columns are spread over a process pool; the workers open the
+#     stored matrix as a memory map instead of receiving a copy
+#
+# Run: python Titanic_Importance.py [n_repeats]
+# ============================================================
+
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Titanic_FeatureStore import FeatureMatrix, FeatureStore
+from Titanic_Training import available_cores
+
+N_REPEATS = 30
+# Upper bound on rows * repeats stacked into one predict call
+MAX_STACKED_ROWS = 2_000_000
+
+
+# ============================================================
+# 1. RAW COLUMNS -> PREPROCESSED COLUMNS
+# ============================================================
+
+def column_groups(columns, raw_features):
+    """{raw feature: indices of the preprocessed columns made from it}.
+
+    Relies on ColumnTransformer's names: 'num__age', 'cat__sex_female', ...
+    """
+    groups = {}
+    for feature in raw_features:
+        groups[feature] = [i for i, c in enumerate(columns)
+                           if c.split('__', 1)[-1] == feature or c.split('__', 1)[-1].startswith(f'{feature}_')]
+    return groups
+
+
+# ============================================================
+# 2. SCORING ALL SHUFFLED COPIES OF ONE COLUMN AT ONCE
+# ============================================================
+
+def permuted_scores(classifier, X, y, group, n_repeats, seed):
+    """Accuracy after shuffling the `group` columns, once per repeat."""
+    n_rows = len(X)
+    rng = np.random.default_rng(seed)
+    scores = []
+    batch = max(1, MAX_STACKED_ROWS // n_rows)
+    for start in range(0, n_repeats, batch):
+        repeats = min(batch, n_repeats - start)
+        # One random permutation of the rows per repeat, drawn together
+        permutations = np.argsort(rng.random((repeats, n_rows)), axis=1)
+        stacked = np.broadcast_to(X, (repeats, n_rows, X.shape[1])).copy()
+        stacked[:, :, group] = X[permutations[:, :, None], np.asarray(group)]
+        predictions = classifier.predict(stacked.reshape(-1, X.shape[1])).reshape(repeats, n_rows)
+        scores.append((predictions == y).mean(axis=1))
+    return np.concatenate(scores)
+
+
+# Worker state, set once per process
+_classifier = _X = _y = None
+
+
+def _init_worker(classifier, directory):
+    global _classifier, _X, _y
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(limits=1)  # the pool already uses every core
+    matrix = FeatureMatrix(directory)
+    _classifier, _X, _y = classifier, matrix.X, matrix.y
+
+
+def _score_feature(group, n_repeats, seed):
+    return permuted_scores(_classifier, _X, _y, group, n_repeats, seed)
+
+
+def permutation_importance(classifier, matrix, raw_features, n_repeats=N_REPEATS, seed=0, workers=None):
+    """{feature: (mean accuracy drop, std, all drops)} on a stored test matrix."""
+    groups = column_groups(matrix.columns, raw_features)
+    baseline = float(np.mean(classifier.predict(matrix.X) == matrix.y))
+    workers = min(workers or available_cores(), len(groups))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(classifier, matrix.directory)) as pool:
+        futures = {feature: pool.submit(_score_feature, group, n_repeats, seed + i)
+                   for i, (feature, group) in enumerate(groups.items())}
+        drops = {feature: baseline - future.result() for feature, future in futures.items()}
+    return {feature: (float(d.mean()), float(d.std()), d) for feature, d in drops.items()}
+
+
+def print_importances(name, importances):
+    print(f"\n{name}: accuracy drop when the column is shuffled (mean +/- std)")
+    for feature, (mean, std, _) in sorted(importances.items(), key=lambda item: -item[1][0]):
+        bar = '#' * max(0, int(round(mean * 200)))
+        print(f"  {feature:<10} {mean:+.4f} +/- {std:.4f}  {bar}")
+
+
+def main(n_repeats=N_REPEATS):
+    from sklearn.base import clone
+    from sklearn.inspection import permutation_importance as sklearn_permutation_importance
+    from sklearn.model_selection import train_test_split
+    from Titanic_ML import load_data, build_preprocessor, build_pipelines, numeric_features, categorical_features
+
+    print("=" * 50)
+    print("PERMUTATION FEATURE IMPORTANCE")
+    print("=" * 50)
+    X, y = load_data()
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    store = FeatureStore()
+    train = store.fit_transform(build_preprocessor(), X_train, y_train)
+    test = store.transform(train, X_test, y_test)
+    raw_features = numeric_features + categorical_features
+
+    for name, pipeline in build_pipelines(build_preprocessor()).items():
+        classifier = clone(pipeline.named_steps['classifier']).fit(train.X, train.y)
+        start = time.perf_counter()
+        importances = permutation_importance(classifier, test, raw_features, n_repeats)
+        batched_seconds = time.perf_counter() - start
+        print_importances(name, importances)
+
+        # The naive way, on the full pipeline, for the timing comparison
+        pipeline.fit(X_train, y_train)
+        start = time.perf_counter()
+        sklearn_permutation_importance(pipeline, X_test, y_test, scoring='accuracy',
+                                       n_repeats=n_repeats, random_state=0)
+        naive_seconds = time.perf_counter() - start
+        print(f"  time: {batched_seconds:.2f}s batched, {naive_seconds:.2f}s with "
+              f"sklearn.inspection.permutation_importance ({naive_seconds / batched_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else N_REPEATS)
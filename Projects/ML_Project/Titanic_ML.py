@@ -8,11 +8,16 @@
 # 3. Model Building & Training
 # 4. Evaluation
 # 5. Model Saving
+#
+# The building blocks (load_data, build_preprocessor, build_pipelines)
+# are plain functions so the other scripts in this folder can reuse them.
 # ============================================================
 
+import os
+import sys
+import time
 import pandas as pd
 import numpy as np
-import seaborn as sns
 import joblib
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
@@ -23,108 +28,169 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 
-print("=" * 50)
-print("1. LOADING DATA")
-print("=" * 50)
+# The offline dataset cache lives next to the seaborn tutorials
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Libraries', 'seaborn'))
+from Seaborn_Datasets import load_dataset  # noqa: E402
 
-# Load the built-in Titanic dataset from seaborn
-df = sns.load_dataset('titanic')
-print(f"Dataset Shape: {df.shape}")
+from Titanic_Artifacts import save_artifact, load_artifact
+from Titanic_Evaluation import evaluate
+from Titanic_Training import fit_candidates_parallel, print_training_report, warm_preprocessing_cache
 
 # We will predict 'survived'. Let's drop some redundant or difficult columns for simplicity
 # 'alive' is exactly the same as 'survived', 'class' is same as 'pclass', 'who' is redundant
 columns_to_drop = ['alive', 'class', 'who', 'adult_male', 'deck', 'embark_town']
-df = df.drop(columns=columns_to_drop)
-
-# Drop rows where the target 'survived' is missing (if any)
-df = df.dropna(subset=['survived'])
-
-X = df.drop('survived', axis=1)
-y = df['survived']
-
-print("\n" + "=" * 50)
-print("2. PREPROCESSING & PIPELINE SETUP")
-print("=" * 50)
 
 # Identify numerical and categorical columns
 numeric_features = ['age', 'fare', 'sibsp', 'parch']
 categorical_features = ['pclass', 'sex', 'embarked']
 
-# Preprocessing for numerical data: Impute missing with median, then scale
-numeric_transformer = Pipeline(steps=[
-    ('imputer', SimpleImputer(strategy='median')),
-    ('scaler', StandardScaler())
-])
-
-# Preprocessing for categorical data: Impute missing with mode, then OneHotEncode
-categorical_transformer = Pipeline(steps=[
-    ('imputer', SimpleImputer(strategy='most_frequent')),
-    ('onehot', OneHotEncoder(handle_unknown='ignore'))
-])
-
-# Combine preprocessing steps using ColumnTransformer
-preprocessor = ColumnTransformer(
-    transformers=[
-        ('num', numeric_transformer, numeric_features),
-        ('cat', categorical_transformer, categorical_features)
+# Fitted preprocessing is cached here (keyed by data + parameters) and reused
+# by every model, every CV fold and every rerun on the same data
+PREPROCESSING_CACHE_DIR = os.path.join('.cache', 'preprocessing')
+PREPROCESSING_CACHE_LIMIT = '500M'
+
+
+def load_data():
+    """Load the Titanic dataset and split it into features X and target y."""
+    # Load the built-in Titanic dataset from seaborn (via the local cache)
+    df = load_dataset('titanic')
+    df = df.drop(columns=columns_to_drop)
+
+    # Drop rows where the target 'survived' is missing (if any)
+    df = df.dropna(subset=['survived'])
+
+    X = df.drop('survived', axis=1)
+    y = df['survived']
+    return X, y
+
+
+def build_preprocessor():
+    """Impute/scale the numeric columns and impute/one-hot the categorical ones."""
+    # Preprocessing for numerical data: Impute missing with median, then scale
+    numeric_transformer = Pipeline(steps=[
+        ('imputer', SimpleImputer(strategy='median')),
+        ('scaler', StandardScaler())
+    ])
+
+    # Preprocessing for categorical data: Impute missing with mode, then OneHotEncode
+    categorical_transformer = Pipeline(steps=[
+        ('imputer', SimpleImputer(strategy='most_frequent')),
+        ('onehot', OneHotEncoder(handle_unknown='ignore'))
     ])
 
-print("Preprocessing pipeline created.")
-
-print("\n" + "=" * 50)
-print("3. MODEL TRAINING")
-print("=" * 50)
-
-# Split the data
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
-print(f"Training data shape: {X_train.shape}")
-print(f"Testing data shape: {X_test.shape}")
-
-# Create full pipelines including the classifier
-rf_pipeline = Pipeline(steps=[('preprocessor', preprocessor),
-                              ('classifier', RandomForestClassifier(n_estimators=100, random_state=42))])
-
-lr_pipeline = Pipeline(steps=[('preprocessor', preprocessor),
-                              ('classifier', LogisticRegression(random_state=42, max_iter=1000))])
-
-# Train models
-print("Training Random Forest...")
-rf_pipeline.fit(X_train, y_train)
-
-print("Training Logistic Regression...")
-lr_pipeline.fit(X_train, y_train)
-
-print("\n" + "=" * 50)
-print("4. EVALUATION")
-print("=" * 50)
-
-# Evaluate Random Forest
-rf_predictions = rf_pipeline.predict(X_test)
-rf_accuracy = accuracy_score(y_test, rf_predictions)
-print(f"Random Forest Accuracy: {rf_accuracy:.4f}")
-print("Random Forest Classification Report:")
-print(classification_report(y_test, rf_predictions))
-
-# Evaluate Logistic Regression
-lr_predictions = lr_pipeline.predict(X_test)
-lr_accuracy = accuracy_score(y_test, lr_predictions)
-print(f"\nLogistic Regression Accuracy: {lr_accuracy:.4f}")
-print("Logistic Regression Classification Report:")
-print(classification_report(y_test, lr_predictions))
-
-print("\n" + "=" * 50)
-print("5. SAVING THE MODEL")
-print("=" * 50)
-
-# Let's say Random Forest performed slightly better, so we save that pipeline
-model_filename = 'titanic_rf_model.joblib'
-joblib.dump(rf_pipeline, model_filename)
-print(f"Model successfully saved as '{model_filename}'")
-
-# Demonstration of loading the model
-loaded_model = joblib.load(model_filename)
-sample_passenger = pd.DataFrame([{
-    'pclass': 3, 'sex': 'male', 'age': 22.0, 'sibsp': 1, 'parch': 0, 'fare': 7.25, 'embarked': 'S'
-}])
-sample_prediction = loaded_model.predict(sample_passenger)
-print(f"\nPrediction for a sample passenger (3rd class, male, 22yo): {'Survived' if sample_prediction[0]==1 else 'Did not survive'}")
+    # Combine preprocessing steps using ColumnTransformer
+    return ColumnTransformer(
+        transformers=[
+            ('num', numeric_transformer, numeric_features),
+            ('cat', categorical_transformer, categorical_features)
+        ])
+
+
+def build_pipelines(preprocessor, memory=None):
+    """Create the full candidate pipelines, each including the classifier.
+
+    Pass a joblib.Memory as `memory` to cache the fitted preprocessor.
+    """
+    rf_pipeline = Pipeline(steps=[('preprocessor', preprocessor),
+                                  ('classifier', RandomForestClassifier(n_estimators=100, random_state=42))],
+                           memory=memory)
+
+    lr_pipeline = Pipeline(steps=[('preprocessor', preprocessor),
+                                  ('classifier', LogisticRegression(random_state=42, max_iter=1000))],
+                           memory=memory)
+    return {'Random Forest': rf_pipeline, 'Logistic Regression': lr_pipeline}
+
+
+def main():
+    print("=" * 50)
+    print("1. LOADING DATA")
+    print("=" * 50)
+
+    X, y = load_data()
+    print(f"Features shape: {X.shape}, target length: {len(y)}")
+
+    print("\n" + "=" * 50)
+    print("2. PREPROCESSING & PIPELINE SETUP")
+    print("=" * 50)
+
+    preprocessor = build_preprocessor()
+    print("Preprocessing pipeline created.")
+
+    print("\n" + "=" * 50)
+    print("3. MODEL TRAINING")
+    print("=" * 50)
+
+    # Split the data
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    print(f"Training data shape: {X_train.shape}")
+    print(f"Testing data shape: {X_test.shape}")
+
+    # Fit the shared preprocessing once (or load it from a previous run)
+    memory = joblib.Memory(PREPROCESSING_CACHE_DIR, verbose=0)
+    start = time.perf_counter()
+    warm_preprocessing_cache(preprocessor, X_train, y_train, memory)
+    print(f"Shared preprocessing ready in {time.perf_counter() - start:.3f}s (cache: '{PREPROCESSING_CACHE_DIR}')")
+
+    # Train all candidate models at the same time, one process each
+    candidates = build_pipelines(preprocessor, memory=memory)
+    print(f"Training {', '.join(candidates)} in parallel...")
+    fitted, training_report = fit_candidates_parallel(candidates, X_train, y_train)
+    print_training_report(training_report)
+    rf_pipeline = fitted['Random Forest']
+    lr_pipeline = fitted['Logistic Regression']
+    memory.reduce_size(bytes_limit=PREPROCESSING_CACHE_LIMIT)  # keep the cache bounded
+
+    print("\n" + "=" * 50)
+    print("4. EVALUATION")
+    print("=" * 50)
+
+    # Evaluate Random Forest
+    rf_predictions = rf_pipeline.predict(X_test)
+    rf_accuracy = accuracy_score(y_test, rf_predictions)
+    print(f"Random Forest Accuracy: {rf_accuracy:.4f}")
+    _, low, high = evaluate(y_test, rf_predictions)['accuracy']
+    print(f"  95% bootstrap confidence interval: [{low:.4f}, {high:.4f}]")
+    print("Random Forest Classification Report:")
+    print(classification_report(y_test, rf_predictions))
+
+    # Evaluate Logistic Regression
+    lr_predictions = lr_pipeline.predict(X_test)
+    lr_accuracy = accuracy_score(y_test, lr_predictions)
+    print(f"\nLogistic Regression Accuracy: {lr_accuracy:.4f}")
+    _, low, high = evaluate(y_test, lr_predictions)['accuracy']
+    print(f"  95% bootstrap confidence interval: [{low:.4f}, {high:.4f}]")
+    print("Logistic Regression Classification Report:")
+    print(classification_report(y_test, lr_predictions))
+
+    print("\n" + "=" * 50)
+    print("5. SAVING THE MODEL")
+    print("=" * 50)
+
+    # Let's say Random Forest performed slightly better, so we save that pipeline
+    # (without the cache, which only matters during training)
+    rf_pipeline.set_params(memory=None)
+    model_filename = 'titanic_rf_model.joblib'
+    joblib.dump(rf_pipeline, model_filename)
+    print(f"Model successfully saved as '{model_filename}'")
+
+    # The same model as an artifact folder: uncompressed (memory-mappable)
+    # plus a manifest with library versions and the expected input columns
+    artifact_dir = 'titanic_rf_artifact'
+    save_artifact(rf_pipeline, artifact_dir, X_train)
+    start = time.perf_counter()
+    load_artifact(artifact_dir, mmap_mode='r', X=X_test)
+    print(f"Artifact saved to '{artifact_dir}/' (reloads in {(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    # Demonstration of loading the model
+    loaded_model = joblib.load(model_filename)
+    sample_passenger = pd.DataFrame([{
+        'pclass': 3, 'sex': 'male', 'age': 22.0, 'sibsp': 1, 'parch': 0, 'fare': 7.25, 'embarked': 'S'
+    }])
+    sample_prediction = loaded_model.predict(sample_passenger)
+    print(f"\nPrediction for a sample passenger (3rd class, male, 22yo): {'Survived' if sample_prediction[0]==1 else 'Did not survive'}")
+
+
+# The guard matters here: worker processes re-import this file, and
+# without it every worker would start training all over again.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+# ============================================================
+# PEAK MEMORY OF THE CURRENT PROCESS
+# ============================================================
+# Shared by the benchmarks, which measure in freshly spawned processes.
+# Standard library only: importing it must not load anything heavy, or
+# the measurement would include the measuring tool.
+#
+# On Linux the peak is read from VmHWM in /proc/self/status, the process's
+# own high-water mark. getrusage's ru_maxrss is not enough there: it is
+# kept across exec, so a spawned child would report its parent's peak when
+# the parent was larger. Elsewhere ru_maxrss is the best stdlib option.
+# ============================================================
+
+import sys
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None if unknown."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024  # reported in kB
+    except OSError:
+        pass  # not Linux
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    scale = 1 if sys.platform == 'darwin' else 1024  # bytes on macOS, kB elsewhere
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20
@@ -0,0 +1,232 @@
+# ============================================================
+# TITANIC MODEL SERVING WITH MICRO-BATCHING
+# ============================================================
+# Titanic_ML.py saves the trained pipeline as 'titanic_rf_model.joblib'.
+# This script serves it over HTTP with FastAPI.
+#
+# Calling model.predict() once per request is slow: most of the time goes
+# into building a one-row DataFrame and running the pipeline's checks,
+# not into the model itself. So concurrent requests are collected into a
+# "micro-batch" and scored with ONE vectorized predict_proba() call.
+#
+# A batch is sent when either:
+# 1. it reaches MAX_BATCH_SIZE requests, or
+# 2. the oldest request has waited MAX_WAIT_MS milliseconds.
+#
+# Run (after training with Titanic_ML.py):
+# uvicorn Titanic_Serving:app --workers 1
+# TITANIC_MODEL_PATH may also point at an artifact folder such as
+# 'titanic_rf_artifact', which is memory-mapped (see Titanic_Artifacts.py)
+# Then POST to /predict and look at /metrics
+#
+# If 'titanic_drift_reference.json' exists (written by Titanic_Drift.py),
+# every scored batch also feeds a drift monitor; see /drift
+# ============================================================
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+from Titanic_Artifacts import load_model
+from Titanic_Drift import DriftMonitor, DriftReference
+
+MODEL_PATH = os.environ.get("TITANIC_MODEL_PATH", "titanic_rf_model.joblib")
+DRIFT_REFERENCE_PATH = os.environ.get("TITANIC_DRIFT_REFERENCE", "titanic_drift_reference.json")
+MAX_BATCH_SIZE = 64
+MAX_WAIT_MS = 5.0
+
+# Input columns, in the order the pipeline was trained on
+FEATURE_COLUMNS = ['pclass', 'sex', 'age', 'sibsp', 'parch', 'fare', 'embarked']
+
+
+# ============================================================
+# 1. HISTOGRAMS FOR BATCH SIZE AND LATENCY
+# ============================================================
+
+class Histogram:
+    """Counts observations into fixed, cumulative-style buckets."""
+
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last bucket is "+Inf"
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        i = int(np.searchsorted(self.bounds, value))  # first bound >= value
+        self.counts[i] += 1
+        self.total += 1
+        self.sum += value
+
+    def snapshot(self):
+        labels = [f"<={b}" for b in self.bounds] + ["+Inf"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.total,
+            "mean": self.sum / self.total if self.total else None,
+        }
+
+
+# ============================================================
+# 2. THE MICRO-BATCHER
+# ============================================================
+
+class MicroBatcher:
+    """Coalesces concurrent single-row requests into batched model calls."""
+
+    def __init__(self, predict_batch, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batch_sizes = Histogram([2 ** i for i in range(max_batch_size.bit_length())])
+        self.latency_ms = Histogram([1, 2, 5, 10, 20, 50, 100, 200, 500, 1000])
+        self.model_ms = Histogram([1, 2, 5, 10, 20, 50, 100, 200, 500, 1000])
+        self._queue = None
+        self._worker = None
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+
+    async def submit(self, row):
+        """Queue one row and wait for its prediction."""
+        future = asyncio.get_running_loop().create_future()
+        start = time.perf_counter()
+        await self._queue.put((row, future))
+        result = await future
+        self.latency_ms.observe((time.perf_counter() - start) * 1000)
+        return result
+
+    async def _collect(self):
+        """Wait for one request, then gather more until full or out of time."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already waiting without sleeping
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            rows = [row for row, _ in batch]
+            self.batch_sizes.observe(len(rows))
+            start = time.perf_counter()
+            try:
+                # Run the model in a thread so the event loop keeps accepting requests
+                results = await asyncio.to_thread(self.predict_batch, rows)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.model_ms.observe((time.perf_counter() - start) * 1000)
+            for (_, future), result in zip(batch, results):
+                if not future.done():  # the client may have gone away
+                    future.set_result(result)
+
+    def metrics(self):
+        return {
+            "batch_size": self.batch_sizes.snapshot(),
+            "request_latency_ms": self.latency_ms.snapshot(),
+            "model_latency_ms": self.model_ms.snapshot(),
+        }
+
+
+# ============================================================
+# 3. LOADING THE MODEL ONCE AT STARTUP
+# ============================================================
+
+def make_predict_batch(model, drift_monitor=None):
+    """Build a function that scores a list of row dicts in one call."""
+    survived_index = list(model.classes_).index(1)
+
+    def predict_batch(rows):
+        frame = pd.DataFrame.from_records(rows, columns=FEATURE_COLUMNS)
+        if drift_monitor is not None:
+            drift_monitor.observe(frame)
+        probabilities = model.predict_proba(frame)
+        labels = model.classes_[probabilities.argmax(axis=1)]
+        return [
+            {"survived": int(label), "probability": float(p)}
+            for label, p in zip(labels, probabilities[:, survived_index])
+        ]
+
+    return predict_batch
+
+
+@asynccontextmanager
+async def lifespan(app):
+    model = load_model(MODEL_PATH)
+    # Warm-up call, so the first real request doesn't pay one-off costs
+    make_predict_batch(model)([{'pclass': 3, 'sex': 'male', 'age': 22.0, 'sibsp': 1,
+                                'parch': 0, 'fare': 7.25, 'embarked': 'S'}])
+    app.state.drift = None
+    if os.path.exists(DRIFT_REFERENCE_PATH):
+        app.state.drift = DriftMonitor(DriftReference.load(DRIFT_REFERENCE_PATH))
+    predict_batch = make_predict_batch(model, app.state.drift)
+    app.state.batcher = MicroBatcher(predict_batch)
+    await app.state.batcher.start()
+    yield
+    await app.state.batcher.stop()
+
+
+app = FastAPI(title="Titanic Survival API", lifespan=lifespan)
+
+
+# ============================================================
+# 4. ENDPOINTS
+# ============================================================
+
+class Passenger(BaseModel):
+    pclass: int
+    sex: str
+    age: Optional[float] = None
+    sibsp: int = 0
+    parch: int = 0
+    fare: Optional[float] = None
+    embarked: Optional[str] = None
+
+
+@app.post("/predict")
+async def predict(passenger: Passenger):
+    """Predict survival for one passenger (batched behind the scenes)."""
+    return await app.state.batcher.submit(passenger.dict())
+
+
+@app.get("/metrics")
+def metrics():
+    """Batch-size and latency histograms collected since startup."""
+    return app.state.batcher.metrics()
+
+
+@app.get("/drift")
+def drift():
+    """Input drift of the recent requests against the training data."""
+    if app.state.drift is None:
+        raise HTTPException(status_code=404, detail=f"No drift reference at '{DRIFT_REFERENCE_PATH}'")
+    return app.state.drift.check()
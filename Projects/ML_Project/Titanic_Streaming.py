@@ -0,0 +1,194 @@
+# ============================================================
+# OUT-OF-CORE INCREMENTAL TRAINING
+# ============================================================
+# Titanic_ML.py loads the whole dataset into one DataFrame. That stops
+# working once the data is bigger than RAM.
+#
+# This script reads a CSV (or Parquet) file in chunks (read_chunks() from
+# Libraries/pandas/Pandas_OutOfCore.py) and learns from one chunk at a
+# time, keeping only small running statistics in memory:
+#   - numeric medians:     a fixed-size random sample (reservoir) per column
+#   - numeric scaling:     StandardScaler.partial_fit (running mean/variance)
+#   - categorical mode:    running value counts
+#   - the model:           SGDClassifier.partial_fit (logistic regression)
+#
+# Each chunk is first scored with the model trained so far and only then
+# used for training ("test-then-train"), which gives an honest accuracy
+# estimate without keeping a separate test set in memory.
+#
+# Run: python Titanic_Streaming.py [passengers.csv|.parquet] [chunk_size]
+# Without a file, the Titanic data is repeated into a large demo CSV.
+# ============================================================
+
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+from Titanic_ML import load_data, numeric_features
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Libraries', 'pandas'))
+from Pandas_OutOfCore import read_chunks  # noqa: E402
+
+# The one-hot layout must be fixed before training starts, because the
+# model's weight vector cannot grow. Unseen values encode as all zeros.
+CATEGORY_VALUES = {
+    'pclass': [1, 2, 3],
+    'sex': ['female', 'male'],
+    'embarked': ['C', 'Q', 'S'],
+}
+TARGET = 'survived'
+
+
+# ============================================================
+# 1. STREAMING STATISTICS
+# ============================================================
+
+class ReservoirMedian:
+    """Approximate median from a uniform random sample of bounded size."""
+
+    def __init__(self, size=10_000, seed=0):
+        self.size = size
+        self.sample = np.empty(size)
+        self.filled = 0
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = values[~np.isnan(values)]
+        # Fill the reservoir first...
+        take = min(len(values), self.size - self.filled)
+        self.sample[self.filled:self.filled + take] = values[:take]
+        self.filled += take
+        self.seen += take
+        rest = values[take:]
+        if len(rest):
+            # ...then keep the i-th value seen with probability size / i
+            positions = self.seen + np.arange(1, len(rest) + 1)
+            keep = self.rng.random(len(rest)) < self.size / positions
+            slots = self.rng.integers(0, self.size, keep.sum())
+            self.sample[slots] = rest[keep]
+            self.seen += len(rest)
+
+    def median(self):
+        return float(np.median(self.sample[:self.filled])) if self.filled else 0.0
+
+
+class StreamingPreprocessor:
+    """Median imputation + scaling + one-hot, with statistics updated per chunk."""
+
+    def __init__(self, numeric=numeric_features, categories=CATEGORY_VALUES):
+        self.numeric = list(numeric)
+        self.categories = categories
+        self.medians = {c: ReservoirMedian(seed=i) for i, c in enumerate(self.numeric)}
+        self.counts = {c: Counter() for c in categories}
+        self.scaler = StandardScaler()
+
+    def partial_fit(self, chunk):
+        for column in self.numeric:
+            self.medians[column].update(chunk[column].to_numpy(dtype=float))
+        for column in self.categories:
+            self.counts[column].update(chunk[column].dropna().tolist())
+        self.scaler.partial_fit(self._impute_numeric(chunk))
+        return self
+
+    def _impute_numeric(self, chunk):
+        numeric = chunk[self.numeric].to_numpy(dtype=float)
+        fill = np.array([self.medians[c].median() for c in self.numeric])
+        return np.where(np.isnan(numeric), fill, numeric)
+
+    def transform(self, chunk):
+        parts = [self.scaler.transform(self._impute_numeric(chunk))]
+        for column, values in self.categories.items():
+            mode = self.counts[column].most_common(1)
+            column_values = chunk[column]
+            if mode:
+                column_values = column_values.fillna(mode[0][0])
+            parts.append(np.column_stack([(column_values == v).to_numpy(dtype=float) for v in values]))
+        return np.hstack(parts)
+
+
+# ============================================================
+# 2. THE INCREMENTAL TRAINING LOOP
+# ============================================================
+
+class IncrementalModel:
+    """Streaming preprocessor + SGD logistic regression, trained chunk by chunk."""
+
+    def __init__(self, random_state=42):
+        self.preprocessor = StreamingPreprocessor()
+        self.classifier = SGDClassifier(loss='log_loss', alpha=1e-4, random_state=random_state)
+        self.classes_ = np.array([0, 1])
+        self.trained = False
+
+    def partial_fit(self, chunk):
+        self.preprocessor.partial_fit(chunk)
+        X = self.preprocessor.transform(chunk)
+        self.classifier.partial_fit(X, chunk[TARGET].to_numpy(), classes=self.classes_)
+        self.trained = True
+        return self
+
+    def predict(self, chunk):
+        return self.classifier.predict(self.preprocessor.transform(chunk))
+
+    def predict_proba(self, chunk):
+        return self.classifier.predict_proba(self.preprocessor.transform(chunk))
+
+
+def train_incrementally(path, chunk_size=50_000):
+    """One pass over the file: score each chunk, then learn from it."""
+    model = IncrementalModel()
+    rows = correct = 0
+    start = time.perf_counter()
+    for i, chunk in enumerate(read_chunks(path, chunk_size), start=1):
+        chunk = chunk.dropna(subset=[TARGET])
+        if chunk.empty:
+            continue  # no labelled rows: nothing to score or learn from
+        if model.trained:
+            correct += int((model.predict(chunk) == chunk[TARGET].to_numpy()).sum())
+            rows += len(chunk)
+        model.partial_fit(chunk)
+        if i % 10 == 0:
+            print(f"  chunk {i}: progressive accuracy {correct / max(rows, 1):.4f}")
+    elapsed = time.perf_counter() - start
+    return model, {'rows_scored': rows, 'accuracy': correct / max(rows, 1), 'seconds': elapsed}
+
+
+def write_demo_csv(path, repeats=200):
+    """Repeat the Titanic rows (shuffled) into a larger CSV, chunk by chunk."""
+    X, y = load_data()
+    frame = X.assign(**{TARGET: y})
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    rng = np.random.default_rng(0)
+    for i in range(repeats):
+        shuffled = frame.iloc[rng.permutation(len(frame))]
+        shuffled.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+    return len(frame) * repeats
+
+
+def main(path=None, chunk_size=50_000):
+    print("=" * 50)
+    print("OUT-OF-CORE INCREMENTAL TRAINING")
+    print("=" * 50)
+    if path is None:
+        path = os.path.join('.cache', 'titanic_stream.csv')
+        n_rows = write_demo_csv(path)
+        print(f"Wrote a demo file with {n_rows:,} rows to '{path}'")
+
+    model, report = train_incrementally(path, chunk_size)
+    print(f"\nRows scored before training on them: {report['rows_scored']:,}")
+    print(f"Progressive (test-then-train) accuracy: {report['accuracy']:.4f}")
+    print(f"Time: {report['seconds']:.1f}s "
+          f"({report['rows_scored'] / report['seconds']:,.0f} rows/s)")
+    medians = {c: round(m.median(), 2) for c, m in model.preprocessor.medians.items()}
+    print(f"Streaming median estimates: {medians}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 50_000)
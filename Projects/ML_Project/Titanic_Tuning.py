@@ -0,0 +1,273 @@
+# ============================================================
+# HYPERPARAMETER TUNING WITH SUCCESSIVE HALVING
+# ============================================================
+# Titanic_ML.py uses fixed settings (n_estimators=100, max_iter=1000).
+# Trying every combination in a grid (GridSearchCV) is thorough but slow:
+# every candidate is cross-validated on all of the data.
+#
+# Successive halving is a tournament:
+# 1. Many random candidates are evaluated on a small slice of the data.
+# 2. Only the best 1/factor of them survive to the next round...
+# 3. ...which uses `factor` times more data.
+# Bad candidates are dropped cheaply, and only the finalists pay full price.
+# The first slice is sized so that the last round always cross-validates
+# on all of the training data: the winner is never picked on a sample.
+#
+# On top of that:
+# - each round's cross-validation fits run in parallel on all cores, and
+# - the pipelines use the preprocessing cache from Titanic_ML.py, so the
+#   shared ColumnTransformer is fitted once per data slice, not per candidate.
+# - a time budget decides how many candidates we can afford, and is
+#   enforced: before every round the remaining time is checked, and if the
+#   round would not fit, the search goes straight to the final round with
+#   as many of the current leaders as the budget still allows.
+# - when halving would not need fewer fits than the full grid (small
+#   grids), the full grid is simply cross-validated instead.
+#
+# Run: python Titanic_Tuning.py [time_budget_seconds]
+# ============================================================
+
+import math
+import sys
+import time
+
+import joblib
+import numpy as np
+from sklearn.base import clone
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold, train_test_split
+
+from Titanic_ML import load_data, build_preprocessor, build_pipelines, PREPROCESSING_CACHE_DIR
+from Titanic_Training import available_cores
+
+# Discrete search spaces, so the cost of the equivalent full grid is well defined
+PARAM_GRIDS = {
+    'Random Forest': {
+        'classifier__n_estimators': [50, 100, 200, 400],
+        'classifier__max_depth': [None, 4, 6, 8, 12],
+        'classifier__min_samples_leaf': [1, 2, 4, 8],
+        'classifier__max_features': ['sqrt', 'log2', None],
+    },
+    'Logistic Regression': {
+        'classifier__C': np.logspace(-3, 2, 11).tolist(),
+        'classifier__class_weight': [None, 'balanced'],
+        'classifier__max_iter': [200, 1000],
+    },
+}
+
+FACTOR = 3
+CV_FOLDS = 5
+# Smallest slice a round may use: a few samples of each class in every fold
+MIN_RESOURCES = CV_FOLDS * 2 * 2
+# The cost model ignores dispatch, caching and refit overhead and times only
+# the default configuration, so plan to use just 1/BUDGET_SAFETY of the budget
+BUDGET_SAFETY = 1.5
+
+
+# ============================================================
+# 1. A SIMPLE COST MODEL FOR THE TIME BUDGET
+# ============================================================
+
+def time_fit(pipeline, X, y):
+    """Seconds for one fit + score, as the search does for each CV split.
+
+    The first run fills the preprocessing cache; the second one is timed,
+    because inside the search most fits find their preprocessing cached.
+    """
+    clone(pipeline).fit(X, y)
+    start = time.perf_counter()
+    clone(pipeline).fit(X, y).score(X, y)
+    return time.perf_counter() - start
+
+
+def halving_schedule(n_candidates, max_resources, factor=FACTOR, min_resources=MIN_RESOURCES):
+    """The (candidates, samples) of each round; the last round uses max_resources.
+
+    Rounds continue while at least two candidates are left for the final
+    one (so the winner is picked on all the data), limited by how often the
+    data can be divided by `factor` without going below min_resources. The
+    first slice is then as large as possible.
+    """
+    n_rounds = max(1, min(math.ceil(math.log(n_candidates, factor) - 1e-9),
+                          1 + int(math.log(max_resources // min_resources, factor) + 1e-9)))
+    first = max_resources // factor ** (n_rounds - 1)
+    return [(int(math.ceil(n_candidates / factor ** i)),
+             max_resources if i == n_rounds - 1 else first * factor ** i)
+            for i in range(n_rounds)]
+
+
+def round_seconds(n_candidates, n_samples, fit_seconds, n_workers, cv=CV_FOLDS):
+    """One round: every candidate fitted on each fold's training part."""
+    n_batches = math.ceil(n_candidates * cv / n_workers)
+    return n_batches * fit_seconds(n_samples * (cv - 1) // cv)
+
+
+def estimate_seconds(schedule, fit_seconds, n_workers):
+    return sum(round_seconds(c, r, fit_seconds, n_workers) for c, r in schedule)
+
+
+def plan_search(budget_seconds, grid_size, max_resources, fit_seconds, n_workers):
+    """The schedule to run: halving with as many candidates as the budget
+    allows, or the whole grid in one round when that is no more work."""
+    grid = [(grid_size, max_resources)]
+    best = halving_schedule(FACTOR, max_resources)
+    for n in range(FACTOR, grid_size + 1):
+        schedule = halving_schedule(n, max_resources)
+        if estimate_seconds(schedule, fit_seconds, n_workers) * BUDGET_SAFETY > budget_seconds:
+            break
+        best = schedule
+    grid_seconds = estimate_seconds(grid, fit_seconds, n_workers)
+    no_saving = (sum(c for c, _ in best) >= grid_size
+                 or grid_seconds <= estimate_seconds(best, fit_seconds, n_workers))
+    if no_saving and grid_seconds * BUDGET_SAFETY <= budget_seconds:
+        return grid
+    return best
+
+
+# ============================================================
+# 2. THE TUNING STAGE
+# ============================================================
+
+def _score_split(pipeline, params, X, y, train, test):
+    model = clone(pipeline).set_params(**params)
+    model.fit(X.iloc[train], y.iloc[train])
+    return model.score(X.iloc[test], y.iloc[test])
+
+
+def evaluate_round(pipeline, candidates, X, y, n_samples, cv, n_workers, seed):
+    """Mean CV accuracy of every candidate on a stratified slice of n_samples rows."""
+    if n_samples < len(X):
+        X, _, y, _ = train_test_split(X, y, train_size=n_samples, stratify=y, random_state=seed)
+    splits = list(cv.split(X, y))
+    scores = joblib.Parallel(n_jobs=n_workers)(
+        joblib.delayed(_score_split)(pipeline, params, X, y, train, test)
+        for params in candidates for train, test in splits)
+    return np.asarray(scores).reshape(len(candidates), len(splits)).mean(axis=1)
+
+
+def tune(name, pipeline, param_grid, X, y, budget_seconds, n_workers):
+    start = time.perf_counter()
+    grid_size = len(ParameterGrid(param_grid))
+    cv = StratifiedKFold(n_splits=CV_FOLDS, shuffle=True, random_state=42)
+    max_resources = len(X)  # the last round cross-validates on all of X
+
+    # Calibrate the cost model: time one fit on a small and on a full training part
+    small = MIN_RESOURCES
+    full = max_resources * (CV_FOLDS - 1) // CV_FOLDS
+    t_small = time_fit(pipeline, X.iloc[:small], y.iloc[:small])
+    t_full = time_fit(pipeline, X.iloc[:full], y.iloc[:full])
+    per_sample = max(t_full - t_small, 0.0) / (full - small)
+
+    def fit_seconds(n_samples):
+        return t_small + (n_samples - small) * per_sample
+
+    schedule = plan_search(budget_seconds, grid_size, max_resources, fit_seconds, n_workers)
+    full_grid = len(schedule) == 1 and schedule[0][0] == grid_size
+    if full_grid:
+        candidates = list(ParameterGrid(param_grid))
+    else:
+        candidates = list(ParameterSampler(param_grid, schedule[0][0], random_state=42))
+    deadline = start + budget_seconds
+    refit_seconds = fit_seconds(max_resources)
+
+    rounds = []
+    best_score = None
+    stopped_early = False
+    predicted = measured = 0.0
+    for i, (n_keep, n_samples) in enumerate(schedule):
+        candidates = candidates[:n_keep]
+        # Scale the model by how far off it has been so far in this search
+        overhead = measured / predicted if predicted else BUDGET_SAFETY
+        remaining = deadline - time.perf_counter() - refit_seconds * overhead
+        cost = round_seconds(len(candidates), n_samples, fit_seconds, n_workers) * overhead
+        if cost > remaining:
+            # Out of time: the leaders go straight to a final round on all the
+            # data, as many of them as still fit (at least the current best)
+            stopped_early = True
+            n_samples = max_resources
+            per_candidate = round_seconds(1, n_samples, fit_seconds, n_workers) * overhead
+            candidates = candidates[:max(1, int(remaining // per_candidate))]
+            if len(candidates) == 1:
+                break  # a lone finalist needs no cross-validation, only the refit
+
+        round_start = time.perf_counter()
+        scores = evaluate_round(pipeline, candidates, X, y, n_samples, cv, n_workers, seed=i)
+        seconds = time.perf_counter() - round_start
+        predicted += round_seconds(len(candidates), n_samples, fit_seconds, n_workers)
+        measured += seconds
+        rounds.append({'candidates': len(candidates), 'samples': n_samples, 'seconds': seconds})
+
+        order = np.argsort(-scores, kind='stable')
+        candidates = [candidates[j] for j in order]
+        best_score = float(scores[order[0]])
+        if n_samples == max_resources:
+            break
+
+    best_params = candidates[0]
+    best_estimator = clone(pipeline).set_params(**best_params).fit(X, y)
+    elapsed = time.perf_counter() - start
+
+    # The same cost model, corrected by the overhead measured in this run
+    overhead = measured / predicted if predicted else 1.0
+    grid_seconds = estimate_seconds([(grid_size, max_resources)], fit_seconds, n_workers) * overhead
+    return {
+        'name': name,
+        'best_params': best_params,
+        'best_score': best_score,
+        'best_estimator': best_estimator,
+        'grid_size': grid_size,
+        'n_candidates': schedule[0][0],
+        'full_grid': full_grid,
+        'rounds': rounds,
+        'stopped_early': stopped_early,
+        'fits': sum(r['candidates'] for r in rounds) * CV_FOLDS + 1,  # + the refit
+        'grid_fits': grid_size * CV_FOLDS + 1,
+        'seconds': elapsed,
+        'budget_seconds': budget_seconds,
+        'grid_seconds_estimate': grid_seconds,
+    }
+
+
+def print_tuning_result(result):
+    print(f"\n--- {result['name']} ---")
+    if result['full_grid']:
+        print(f"Full grid: {result['grid_size']} configurations; small enough to try them all")
+    else:
+        print(f"Full grid: {result['grid_size']} configurations; "
+              f"halving started with {result['n_candidates']} random ones")
+    for i, r in enumerate(result['rounds'], start=1):
+        print(f"  round {i}: {r['candidates']:4d} candidates x {r['samples']:4d} samples {r['seconds']:6.1f}s")
+    if result['stopped_early']:
+        print("  time budget reached: the leaders went straight to a final round on all samples")
+    if result['best_score'] is None:
+        print("Best CV accuracy: n/a (the budget did not allow a single round)")
+    else:
+        print(f"Best CV accuracy: {result['best_score']:.4f}")
+    print(f"Best configuration: {result['best_params']}")
+    print(f"Fits: {result['fits']} (full grid: {result['grid_fits']}, "
+          f"{1 - result['fits'] / result['grid_fits']:.0%} fewer)")
+    print(f"Wall time: {result['seconds']:.1f}s of a {result['budget_seconds']:.0f}s budget "
+          f"(full grid estimated at {result['grid_seconds_estimate']:.1f}s)")
+
+
+def main(time_budget_seconds=60.0):
+    print("=" * 50)
+    print("SUCCESSIVE-HALVING HYPERPARAMETER SEARCH")
+    print("=" * 50)
+    X, y = load_data()
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+    n_workers = available_cores()
+    memory = joblib.Memory(PREPROCESSING_CACHE_DIR, verbose=0)
+    pipelines = build_pipelines(build_preprocessor(), memory=memory)
+    budget_each = time_budget_seconds / len(pipelines)
+    print(f"Time budget: {time_budget_seconds:.0f}s ({budget_each:.0f}s per pipeline), {n_workers} worker(s)")
+
+    for name, pipeline in pipelines.items():
+        result = tune(name, pipeline, PARAM_GRIDS[name], X_train, y_train, budget_each, n_workers)
+        print_tuning_result(result)
+        print(f"Held-out test accuracy of the best {name}: "
+              f"{result['best_estimator'].score(X_test, y_test):.4f}")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 60.0)